@@ -1,13 +1,38 @@
+import base64
+import csv
+import fcntl
+import functools
+import hashlib
+import io
+import json
 import os
+import queue
+import re
 import sqlite3
+import threading
+import time
 import uuid
-import pdfplumber
-import docx2txt
-from flask import Flask, request, jsonify, g
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from flask import Flask, Response, abort, request, jsonify, g, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
+from auth import IdentityCache, TokenSigner
+from db_pool import ConnectionPool
+from metrics import Registry, TimedConnection
+from migrations import run_migrations, schema_is_current
+from notification_writer import NotificationWriter
+from pubsub import EventBroker
+from resume_cache import ResumeCache
+from resume_parser import extract_docx_text, extract_pdf_text, load_parsers
+from resume_pool import ParsePool
+from response_cache import ResponseCache
+from screening_jobs import ScreeningQueue
+from skill_matcher import DEFAULT_SKILLS, SkillMatcher
+from uploads import UploadRequest, body_limit, read_upload, upload_ext
 
 # -------------------------------------------------------------------------
 # App Setup
@@ -16,50 +41,307 @@ from dotenv import load_dotenv
 load_dotenv()
 
 app = Flask(__name__)
+# Keep uploads in memory instead of saving them under an uploads folder
+app.request_class = UploadRequest
 # Load CORS origins from environment variable
 CORS(app, origins=os.environ.get("CORS_ORIGINS", "*").split(','))
 
 DATABASE = "aegis.db"
-UPLOAD_FOLDER = "uploads"
 ALLOWED_EXTENSIONS = {"pdf", "docx", "doc"}
 
-app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+# Upload limits: whole request, single file, and in-memory spool before spilling to a temp file
+app.config["MAX_CONTENT_LENGTH"] = int(os.environ.get("MAX_CONTENT_LENGTH", 50 * 1024 * 1024))
+app.config["MAX_FILE_BYTES"] = int(os.environ.get("MAX_FILE_BYTES", 10 * 1024 * 1024))
+app.config["UPLOAD_SPOOL_BYTES"] = int(os.environ.get("UPLOAD_SPOOL_BYTES", 1024 * 1024))
+# POST /api/jobs/bulk streams large NDJSON/CSV feeds, so it has its own body limit
+app.config["BULK_MAX_BYTES"] = int(os.environ.get("BULK_MAX_BYTES", 1024 * 1024 * 1024))
 # Use a more secure secret key for production
-app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "a_very_insecure_default_key")
+DEFAULT_SECRET_KEY = "a_very_insecure_default_key"
+app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", DEFAULT_SECRET_KEY)
+# Bearer tokens issued by login/register. With AUTH_REQUIRED unset, requests
+# without a token are still served, but a token that is sent must be valid
+# and match the user the request acts for.
+app.config["AUTH_TOKEN_TTL"] = int(os.environ.get("AUTH_TOKEN_TTL", 7 * 24 * 3600))
+app.config["AUTH_REQUIRED"] = os.environ.get("AUTH_REQUIRED", "").lower() in ("1", "true", "yes")
+# Cached user id -> name/email/role lookups
+app.config["IDENTITY_CACHE_TTL"] = float(os.environ.get("IDENTITY_CACHE_TTL", 300))
+app.config["IDENTITY_CACHE_ENTRIES"] = int(os.environ.get("IDENTITY_CACHE_ENTRIES", 10000))
+# SQLite connection pool (per worker process)
+app.config["DB_POOL_SIZE"] = int(os.environ.get("DB_POOL_SIZE", 8))
+app.config["DB_POOL_TIMEOUT"] = float(os.environ.get("DB_POOL_TIMEOUT", 10))
+app.config["DB_BUSY_TIMEOUT_MS"] = int(os.environ.get("DB_BUSY_TIMEOUT_MS", 5000))
+app.config["DB_MMAP_SIZE"] = int(os.environ.get("DB_MMAP_SIZE", 256 * 1024 * 1024))
+app.config["DB_CACHE_SIZE_KB"] = int(os.environ.get("DB_CACHE_SIZE_KB", 64 * 1024))
+# Upper bound for ?limit= on paginated list endpoints
+app.config["PAGE_MAX_LIMIT"] = int(os.environ.get("PAGE_MAX_LIMIT", 200))
+# Resume parsing pool (PARSE_WORKERS=0 parses inline on the request thread)
+app.config["PARSE_WORKERS"] = int(os.environ.get("PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+app.config["PARSE_TIMEOUT"] = float(os.environ.get("PARSE_TIMEOUT", 30))
+app.config["PARSE_MAX_TASKS_PER_CHILD"] = int(os.environ.get("PARSE_MAX_TASKS_PER_CHILD", 50))
+app.config["PARSE_MAX_RSS_MB"] = int(os.environ.get("PARSE_MAX_RSS_MB", 512))
+# PDF extraction: "full" (pdfplumber, layout-aware) or "fast" (pdfminer text converter),
+# page/character caps (0 = unlimited) and a per-document time budget in seconds
+# after which the text extracted so far is returned, flagged as partial
+app.config["PARSE_MODE"] = os.environ.get("PARSE_MODE", "full")
+app.config["PARSE_MAX_PAGES"] = int(os.environ.get("PARSE_MAX_PAGES", 20))
+app.config["PARSE_MAX_CHARS"] = int(os.environ.get("PARSE_MAX_CHARS", 50000))
+app.config["PARSE_TIME_BUDGET"] = float(os.environ.get("PARSE_TIME_BUDGET", 10))
+# Parsed resume cache (in-process LRU + SQLite file)
+app.config["RESUME_CACHE_DB"] = os.environ.get("RESUME_CACHE_DB", "resume_cache.db")
+app.config["RESUME_CACHE_BYTES"] = int(os.environ.get("RESUME_CACHE_BYTES", 64 * 1024 * 1024))
+# How often a worker checks whether the skill taxonomy has changed
+app.config["SKILL_TAXONOMY_CHECK_SECONDS"] = float(os.environ.get("SKILL_TAXONOMY_CHECK_SECONDS", 5))
+# Duplicate resumes in a /api/resume/screen batch are folded into one
+# candidate: byte-identical files always, texts at least this similar
+# (estimated Jaccard on 5-word shingles) too; 0 turns the latter off
+app.config["DEDUPE_SIMILARITY"] = float(os.environ.get("DEDUPE_SIMILARITY", 0.8))
+# Files parsed per step by the background screening worker
+app.config["SCREENING_BATCH_SIZE"] = int(os.environ.get("SCREENING_BATCH_SIZE", 16))
+# How often a worker re-reads the catalog generation for cached /api/companies and /api/jobs
+app.config["CATALOG_CHECK_SECONDS"] = float(os.environ.get("CATALOG_CHECK_SECONDS", 1))
+app.config["CATALOG_CACHE_ENTRIES"] = int(os.environ.get("CATALOG_CACHE_ENTRIES", 256))
+# Read notifications older than this are deleted, checked at most once per interval
+# whenever a worker marks notifications read
+app.config["NOTIFICATION_RETENTION_DAYS"] = int(os.environ.get("NOTIFICATION_RETENTION_DAYS", 30))
+app.config["NOTIFICATION_COMPACT_INTERVAL"] = float(os.environ.get("NOTIFICATION_COMPACT_INTERVAL", 3600))
+# Most ids accepted by one bulk mark-read, well under SQLite's bound parameter limit
+app.config["NOTIFICATION_READ_MAX_IDS"] = int(os.environ.get("NOTIFICATION_READ_MAX_IDS", 500))
+# SSE stream: how long to wait for a live event before re-checking the DB and
+# sending a keep-alive, and how long one connection is held before the client
+# is told to reconnect (it resumes from Last-Event-ID)
+app.config["STREAM_POLL_SECONDS"] = float(os.environ.get("STREAM_POLL_SECONDS", 15))
+app.config["STREAM_MAX_SECONDS"] = float(os.environ.get("STREAM_MAX_SECONDS", 300))
+app.config["STREAM_RETRY_MS"] = int(os.environ.get("STREAM_RETRY_MS", 3000))
+# Each open stream holds a worker thread for up to STREAM_MAX_SECONDS, so
+# streams need a threaded worker (gunicorn -k gthread, or asgi.py) and are
+# capped per process; keep the cap below the worker's thread count
+# (--threads, or ASGI_STREAM_THREADS). Gunicorn sync workers refuse them.
+app.config["STREAM_MAX_CLIENTS"] = int(os.environ.get("STREAM_MAX_CLIENTS", 32))
+# Notifications are inserted by a background writer in batches collected over this window
+app.config["NOTIFICATION_FLUSH_SECONDS"] = float(os.environ.get("NOTIFICATION_FLUSH_SECONDS", 0.05))
+app.config["NOTIFICATION_BATCH_SIZE"] = int(os.environ.get("NOTIFICATION_BATCH_SIZE", 500))
+# ASGI mode (asgi.py) thread pools: JSON routes, multipart uploads and event streams
+app.config["ASGI_THREADS"] = int(os.environ.get("ASGI_THREADS", app.config["DB_POOL_SIZE"]))
+app.config["ASGI_UPLOAD_THREADS"] = int(os.environ.get("ASGI_UPLOAD_THREADS", 2 * max(app.config["PARSE_WORKERS"], 1)))
+app.config["ASGI_STREAM_THREADS"] = int(os.environ.get("ASGI_STREAM_THREADS", 100))
+# Jobs upserted per transaction by POST /api/jobs/bulk
+app.config["BULK_BATCH_SIZE"] = int(os.environ.get("BULK_BATCH_SIZE", 1000))
+# Default number of jobs returned by /api/resume/job-finding
+app.config["JOB_FINDING_LIMIT"] = int(os.environ.get("JOB_FINDING_LIMIT", 50))
+
+@app.errorhandler(400)
+def bad_request(error):
+    return jsonify({"error": error.description or "Bad request"}), 400
+
+@app.errorhandler(413)
+def upload_too_large(error):
+    return jsonify({"error": error.description or "Upload too large"}), 413
 
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# -------------------------------------------------------------------------
+# Metrics
+# -------------------------------------------------------------------------
+metrics = Registry()
+http_requests = metrics.counter(
+    "aegis_http_requests_total", "HTTP requests by route, method and status code.", ("route", "method", "status"))
+http_latency = metrics.histogram(
+    "aegis_http_request_duration_seconds", "Time to produce the response, by route.", ("route", "method"))
+request_sql_queries = metrics.histogram(
+    "aegis_request_sql_queries", "SQL statements run through get_db() per request.", ("route",),
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250))
+request_sql_seconds = metrics.histogram(
+    "aegis_request_sql_seconds", "Time spent executing SQL per request.", ("route",))
+resume_parse_seconds = metrics.histogram(
+    "aegis_resume_parse_seconds", "Resume text extraction time by file type.", ("format",),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+skill_extraction_seconds = metrics.histogram(
+    "aegis_skill_extraction_seconds", "Skill extraction time per text.",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+upload_files = metrics.counter("aegis_upload_files_total", "Uploaded files by route.", ("route",))
+upload_bytes = metrics.counter("aegis_upload_bytes_total", "Uploaded file bytes by route.", ("route",))
+metrics.gauge("aegis_db_pool_connections", "Open pooled SQLite connections.", lambda: db_pool.stats()["size"])
+metrics.gauge("aegis_db_pool_in_use", "Pooled SQLite connections checked out.", lambda: db_pool.stats()["inUse"])
+metrics.counter_func("aegis_resume_cache_hits_total", "Resume cache hits since start.", lambda: resume_cache.stats()["hits"])
+metrics.counter_func("aegis_resume_cache_misses_total", "Resume cache misses since start.", lambda: resume_cache.stats()["misses"])
+metrics.counter_func("aegis_identity_cache_hits_total", "Identity cache hits since start.", lambda: identity_cache.stats()["hits"])
+metrics.counter_func("aegis_identity_cache_misses_total", "Identity cache misses since start.", lambda: identity_cache.stats()["misses"])
+metrics.gauge("aegis_stream_subscribers", "Open event streams.", lambda: event_broker.stats()["subscribers"])
+metrics.gauge("aegis_notification_writer_pending", "Notifications queued for the background writer.",
+              lambda: notification_writer.stats()["pending"])
+metrics.counter_func("aegis_notification_writer_batches_total", "Notification batches written since start.",
+              lambda: notification_writer.stats()["batches"])
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    started = g.get("request_started")
+    if started is not None:
+        http_latency.observe(time.perf_counter() - started, route, request.method)
+    http_requests.inc(route, request.method, str(response.status_code))
+
+    db = g.get("db")
+    request_sql_queries.observe(db.queries if db else 0, route)
+    request_sql_seconds.observe(db.seconds if db else 0.0, route)
+
+    spools = request.upload_spools
+    if spools:
+        upload_files.inc(route, amount=len(spools))
+        upload_bytes.inc(route, amount=sum(spool.written for spool in spools))
+    return response
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    return Response(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
 # -------------------------------------------------------------------------
 # Database Helpers
 # -------------------------------------------------------------------------
+db_pool = ConnectionPool(
+    DATABASE,
+    max_size=app.config["DB_POOL_SIZE"],
+    timeout=app.config["DB_POOL_TIMEOUT"],
+    busy_timeout_ms=app.config["DB_BUSY_TIMEOUT_MS"],
+    mmap_size=app.config["DB_MMAP_SIZE"],
+    cache_size_kb=app.config["DB_CACHE_SIZE_KB"],
+)
+
 def get_db():
     if "db" not in g:
-        g.db = sqlite3.connect(DATABASE)
-        g.db.row_factory = sqlite3.Row
+        g.db = TimedConnection(db_pool.acquire())
     return g.db
 def migrate():
-    conn = sqlite3.connect(DATABASE)
-    cur = conn.cursor()
-
-    cur.execute("PRAGMA table_info(session_requests)")
-    cols = [c[1] for c in cur.fetchall()]
+    # Versioned migrations live in migrations.py; each applies only once
+    conn = sqlite3.connect(DATABASE, timeout=30)
+    try:
+        version = run_migrations(conn)
+        print(f"Database schema at version {version} ✅")
+    finally:
+        conn.close()
 
-    if "programmer_id" not in cols:
-        print("Adding programmer_id column...")
-        cur.execute("ALTER TABLE session_requests ADD COLUMN programmer_id TEXT")
+@contextmanager
+def unit_of_work():
+    """
+    Run a block as one transaction on the request's connection: commit once
+    at the end, or roll back if it raises. Callbacks registered with
+    `after_commit` inside the block run only after the commit succeeded.
+    A nested block joins the outer one.
+    """
+    if "after_commit" in g:
+        yield get_db()
+        return
+    db = get_db()
+    g.after_commit = []
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        g.pop("after_commit")
+        raise
+    for callback in g.pop("after_commit"):
+        callback()
+
+def after_commit(callback):
+    """Defer `callback` until the current unit_of_work commits; outside one, run it now."""
+    pending = g.get("after_commit")
+    if pending is None:
+        callback()
     else:
-        print("programmer_id already exists ✅")
+        pending.append(callback)
 
-    if "status" not in cols:
-        print("Adding status column...")
-        cur.execute("ALTER TABLE session_requests ADD COLUMN status TEXT DEFAULT 'pending'")
-    conn.commit()
-    conn.close()
 @app.teardown_appcontext
 def close_db(error=None):
     db = g.pop("db", None)
     if db:
-        db.close()
+        db_pool.release(db.conn)
+
+@app.route("/api/db/pool", methods=["GET"])
+def db_pool_stats():
+    return jsonify({"pool": db_pool.stats()})
+
+# -------------------------------------------------------------------------
+# Keyset Pagination
+# -------------------------------------------------------------------------
+def encode_cursor(created_at, row_id):
+    raw = json.dumps([created_at, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return created_at, row_id
+    except Exception:
+        abort(400, "Invalid cursor")
+
+def page_args():
+    """
+    Read ?limit= and ?cursor= from the query string. Returns (None, None)
+    when no limit is given, which keeps the old unpaginated behaviour.
+    """
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    if limit is None:
+        if cursor:
+            abort(400, "cursor requires limit")
+        return None, None
+    try:
+        limit = int(limit)
+    except ValueError:
+        abort(400, "limit must be an integer")
+    if limit < 1:
+        abort(400, "limit must be positive")
+    return min(limit, app.config["PAGE_MAX_LIMIT"]), cursor
+
+def fetch_page(db, columns, from_sql, conditions=(), params=(), created_col="created_at", id_col="id",
+               default_order=None):
+    """
+    Select `columns` FROM `from_sql` filtered by `conditions`.
+
+    With ?limit= the rows come back newest first, keyed on (created_col,
+    id_col), along with an opaque cursor for the next page (None on the last
+    page). Without it every row is returned in `default_order` and the
+    cursor is None.
+    """
+    limit, cursor = page_args()
+    conditions, params = list(conditions), list(params)
+
+    if limit is None:
+        sql = f"SELECT {columns} FROM {from_sql}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if default_order:
+            sql += f" ORDER BY {default_order}"
+        return [dict(r) for r in db.execute(sql, params).fetchall()], None
+
+    if cursor:
+        conditions.append(f"({created_col}, {id_col}) < (?, ?)")
+        params.extend(decode_cursor(cursor))
+    sql = f"SELECT {columns}, {created_col} AS _page_created, {id_col} AS _page_id FROM {from_sql}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY {created_col} DESC, {id_col} DESC LIMIT ?"
+    rows = db.execute(sql, params + [limit + 1]).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["_page_created"], rows[-1]["_page_id"])
+    items = []
+    for row in rows:
+        item = dict(row)
+        del item["_page_created"], item["_page_id"]
+        items.append(item)
+    return items, next_cursor
+
+def paged_response(key, items, next_cursor):
+    body = {key: items}
+    if "limit" in request.args:
+        body["next"] = next_cursor
+    return jsonify(body)
 
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -150,7 +432,10 @@ def init_db():
 
     db.commit()
     migrate()  # Run database migrations
+    if seed_skills():
+        reindex_job_skills(missing_only=False)
     insert_sample_data()
+    reindex_job_skills()
 
 def insert_sample_data():
     db = get_db()
@@ -170,26 +455,190 @@ def insert_sample_data():
                (str(uuid.uuid4()), "Full-Stack Dev", "Build web apps", "React, Node.js", "Remote", companies[0]["id"]))
     db.commit()
 
+def seed_skills():
+    """Load the default skill taxonomy into an empty skills table."""
+    db = get_db()
+    if db.execute("SELECT COUNT(*) FROM skills").fetchone()[0] > 0:
+        return False
+    db.executemany("INSERT INTO skills (name) VALUES (?)", [(name,) for name in DEFAULT_SKILLS])
+    db.executemany("INSERT OR IGNORE INTO skill_aliases (alias, skill) VALUES (?,?)",
+                   [(alias, name) for name, aliases in DEFAULT_SKILLS.items() for alias in aliases])
+    db.commit()
+    return True
+
+def reindex_job_skills(missing_only=True):
+    """Index skills for jobs with no job_skills rows yet, or for every job."""
+    db = get_db()
+    query = "SELECT id, description, requirements FROM jobs"
+    if missing_only:
+        query += " WHERE id NOT IN (SELECT DISTINCT job_id FROM job_skills)"
+    jobs = db.execute(query).fetchall()
+    for job in jobs:
+        index_job_skills(db, job["id"], job["description"], job["requirements"])
+    db.commit()
+
+def reindex_jobs_mentioning(terms):
+    """
+    Re-extract skills only for jobs whose description or requirements
+    contain one of `terms`, found through jobs_fts. Adding those terms to
+    the taxonomy cannot change what is extracted from any other job.
+    """
+    if not all(re.search(r"\w", term) for term in terms):
+        # No words for the full-text index to look up
+        reindex_job_skills(missing_only=False)
+        return
+    # Each term as an FTS phrase, tokenized the same way as the indexed text
+    phrases = " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+    db = get_db()
+    jobs = db.execute("""
+        SELECT j.id, j.description, j.requirements
+        FROM jobs_fts
+        JOIN jobs_fts_ids f ON f.seq = jobs_fts.rowid
+        JOIN jobs j ON j.id = f.job_id
+        WHERE jobs_fts MATCH ?
+    """, (f"{{description requirements}} : ({phrases})",)).fetchall()
+    index_jobs_skills(db, [(job["id"], job["description"], job["requirements"]) for job in jobs])
+    db.commit()
+
+def index_job_skills(db, job_id, description, requirements):
+    """Replace the stored skills for a job. Caller commits."""
+    index_jobs_skills(db, [(job_id, description, requirements)])
+
+def index_jobs_skills(db, jobs):
+    """Replace the stored skills for many (job_id, description, requirements) jobs. Caller commits."""
+    db.executemany("DELETE FROM job_skills WHERE job_id=?", [(job_id,) for job_id, _, _ in jobs])
+    db.executemany("INSERT INTO job_skills (skill, job_id) VALUES (?,?)", [
+        (skill, job_id)
+        for job_id, description, requirements in jobs
+        for skill in extract_skills_from_text(f"{description} {requirements or ''}")
+    ])
+
 # -------------------------------------------------------------------------
 # Resume Parsing & Analysis
 # -------------------------------------------------------------------------
-def parse_resume(file_path):
-    ext = file_path.rsplit(".", 1)[1].lower()
+def parse_resume(source, ext=None):
+    """
+    Extract text from a resume. `source` may be a file path, an open binary
+    stream (e.g. an upload) or raw bytes; `ext` is required for the latter two.
+    """
+    return parse_resume_detailed(source, ext)["text"]
+
+def parse_resume_detailed(source, ext=None):
+    """
+    Like parse_resume, but returns {"text", "partial"}. PDFs are read with
+    the PARSE_MODE extractor under the PARSE_MAX_PAGES / PARSE_MAX_CHARS
+    caps; `partial` is set when PARSE_TIME_BUDGET ran out first.
+    """
+    if ext is None:
+        ext = upload_ext(source)
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    if ext == "pdf":
+        result = extract_pdf_text(
+            source,
+            fast=app.config["PARSE_MODE"] == "fast",
+            max_pages=app.config["PARSE_MAX_PAGES"],
+            max_chars=app.config["PARSE_MAX_CHARS"],
+            budget=app.config["PARSE_TIME_BUDGET"],
+        )
+        return {"text": result["text"], "partial": result["partial"]}
     text = ""
     try:
-        if ext == "pdf":
-            with pdfplumber.open(file_path) as pdf:
-                text = "\n".join([page.extract_text() or "" for page in pdf.pages])
-        elif ext in {"docx", "doc"}:
-            text = docx2txt.process(file_path)
+        if ext in {"docx", "doc"}:
+            text = extract_docx_text(source)
     except Exception as e:
         print(f"Error parsing resume: {e}")
-    return text or ""
+    return {"text": text or "", "partial": False}
+
+FAILED_PARSE = {"text": "", "partial": False}
+
+parse_pool = ParsePool(
+    parse_resume_detailed,
+    workers=app.config["PARSE_WORKERS"],
+    timeout=app.config["PARSE_TIMEOUT"],
+    max_tasks_per_child=app.config["PARSE_MAX_TASKS_PER_CHILD"],
+    max_rss_mb=app.config["PARSE_MAX_RSS_MB"],
+    on_timing=lambda args, seconds: resume_parse_seconds.observe(seconds, args[1]),
+)
+
+skill_matcher = None
+skill_matcher_checked = float("-inf")
+
+def get_skill_matcher():
+    """Return the compiled skill matcher, rebuilding it when the taxonomy version changes."""
+    global skill_matcher, skill_matcher_checked
+    now = time.monotonic()
+    if skill_matcher is not None and now - skill_matcher_checked < app.config["SKILL_TAXONOMY_CHECK_SECONDS"]:
+        return skill_matcher
+
+    db = get_db()
+    version = db.execute("SELECT version FROM skill_taxonomy_version WHERE id=1").fetchone()[0]
+    if skill_matcher is None or skill_matcher.version != version:
+        rows = db.execute("SELECT name, name FROM skills UNION ALL SELECT alias, skill FROM skill_aliases").fetchall()
+        skill_matcher = SkillMatcher({alias: skill for alias, skill in rows}, version)
+    skill_matcher_checked = now
+    return skill_matcher
 
 def extract_skills_from_text(text):
-    skills_db = ["Python", "JavaScript", "React", "Node.js", "SQL", "AWS", "Docker", "ML"]
-    text = text.lower()
-    return [s for s in skills_db if s.lower() in text]
+    matcher = get_skill_matcher()
+    with skill_extraction_seconds.time():
+        return matcher.extract(text)
+
+resume_cache = ResumeCache(app.config["RESUME_CACHE_DB"], max_bytes=app.config["RESUME_CACHE_BYTES"])
+
+def parse_resumes_cached(uploads):
+    """
+    Parse a list of (data, ext) uploads, returning {"text", "skills"} entries
+    in the same order. Only files whose SHA-256 is not cached hit the pool.
+    """
+    entries = [None] * len(uploads)
+    for i, entry in iter_parse_resumes_cached(uploads):
+        entries[i] = entry
+    return entries
+
+def iter_parse_resumes_cached(uploads):
+    """
+    Yield (index, entry) for each (data, ext) upload as soon as it is
+    available: cache hits first, then the misses as the pool parses them.
+    """
+    keys = [resume_cache.key(data) for data, _ in uploads]
+    misses = []
+    for i, key in enumerate(keys):
+        entry = resume_cache.get(key)
+        if entry is None:
+            misses.append(i)
+        else:
+            yield i, refresh_cached_skills(key, entry)
+
+    if misses:
+        # Imported here, before the pool forks, so its workers inherit them
+        load_parsers()
+    results = parse_pool.imap([uploads[i] for i in misses], default=FAILED_PARSE)
+    for i, result in zip(misses, results):
+        yield i, cache_resume_text(keys[i], result["text"], result["partial"])
+
+def parse_resume_cached(data, ext):
+    # A single upload still goes through the parsing pool, so the request
+    # thread only waits instead of running pdfplumber under the GIL
+    _, entry = next(iter_parse_resumes_cached([(data, ext)]))
+    return entry
+
+def cache_resume_text(key, text, partial=False):
+    matcher = get_skill_matcher()
+    with skill_extraction_seconds.time():
+        skills = matcher.extract(text)
+    entry = {"text": text, "skills": skills, "version": matcher.version}
+    if partial:
+        # Cut short by the time budget: flag it and let a later upload retry
+        return {**entry, "partial": True}
+    # Don't cache failed or timed-out parses so they can be retried
+    return resume_cache.put(key, **entry) if text else entry
+
+def refresh_cached_skills(key, entry):
+    # Skills cached under an older taxonomy are re-extracted from the cached text
+    if entry["version"] != get_skill_matcher().version:
+        return cache_resume_text(key, entry["text"])
+    return entry
 
 def calculate_match_score(resume_skills, job_skills):
     if not job_skills:
@@ -204,29 +653,29 @@ def analyze_resume_api():
     if not resume_file or not allowed_file(resume_file.filename):
         return jsonify({"error": "Invalid or missing resume file"}), 400
 
-    filename = secure_filename(resume_file.filename)
-    file_path = os.path.join(app.config["UPLOAD_FOLDER"], f"{uuid.uuid4()}_{filename}")
-    resume_file.save(file_path)
-
-    resume_text = parse_resume(file_path)
-    os.remove(file_path)
+    entry = parse_resume_cached(read_upload(resume_file), upload_ext(resume_file.filename))
 
-    analysis = analyze_resume_logic(resume_text, job_desc)
+    analysis = analyze_resume_logic(entry["text"], job_desc, entry["skills"])
     
-    return jsonify({"analysis": analysis})
+    return jsonify({"analysis": analysis, "partialParse": entry.get("partial", False)})
 
-def analyze_resume_logic(resume_text, job_desc):
+@app.route("/api/resume/cache/stats", methods=["GET"])
+def resume_cache_stats():
+    return jsonify({"cache": resume_cache.stats()})
+
+def analyze_resume_logic(resume_text, job_desc, resume_skills=None):
     """
     Analyzes resume text against a job description.
     Returns ATS-style score, matched/missing skills, and recommendations.
+    Pass `resume_skills` when they are already known (e.g. from the resume cache).
     """
-    # Define a skills database (can later come from DB)
-    skills_db = ["Python", "JavaScript", "React", "Node.js", "SQL", "AWS", "Docker", "ML"]
-
     # Extract skills from resume and job description
-    resume_skills = [s for s in skills_db if s.lower() in resume_text.lower()]
-    job_skills = [s for s in skills_db if s.lower() in job_desc.lower()]
+    if resume_skills is None:
+        resume_skills = extract_skills_from_text(resume_text)
+    return skill_analysis(resume_skills, extract_skills_from_text(job_desc))
 
+def skill_analysis(resume_skills, job_skills):
+    """Score already-extracted resume skills against a job's skills."""
     # Compute overlap
     skills_found = list(set(resume_skills) & set(job_skills))
     skills_missing = list(set(job_skills) - set(resume_skills))
@@ -253,6 +702,58 @@ def analyze_resume_logic(resume_text, job_desc):
 # -------------------------------------------------------------------------
 # Auth Routes
 # -------------------------------------------------------------------------
+token_signer = TokenSigner(app.config["SECRET_KEY"], app.config["AUTH_TOKEN_TTL"])
+identity_cache = IdentityCache(app.config["IDENTITY_CACHE_TTL"], app.config["IDENTITY_CACHE_ENTRIES"])
+
+def get_identity(user_id):
+    """Cached {"id", "name", "email", "role"} for a user id, or None if there is no such user."""
+    return identity_cache.get(get_db(), user_id)
+
+def auth_response(user, status):
+    return jsonify({
+        "user": user,
+        "token": token_signer.issue(user["id"], user["role"]),
+        "expiresIn": app.config["AUTH_TOKEN_TTL"],
+    }), status
+
+def authenticated(view):
+    """
+    Verify the request's bearer token, if any, and expose its claims as
+    g.identity. A forged or expired token is rejected; so is a missing one
+    when AUTH_REQUIRED is set.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        header = request.headers.get("Authorization", "")
+        # EventSource can't set headers, so the stream passes ?token= instead
+        token = header[7:] if header.startswith("Bearer ") else request.args.get("token")
+        g.identity = None
+        if token:
+            g.identity = token_signer.verify(token)
+            if g.identity is None:
+                return jsonify({"error": "Invalid or expired token"}), 401
+        elif app.config["AUTH_REQUIRED"]:
+            return jsonify({"error": "Authentication required"}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+def acting_as(user_id):
+    """False when the request carries a token for a different user."""
+    identity = g.get("identity")
+    return identity is None or identity["id"] == user_id
+
+def role_required(*roles):
+    """Reject a token whose role is not one of `roles`. Goes under @authenticated."""
+    def decorate(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            identity = g.get("identity")
+            if identity is not None and identity["role"] not in roles:
+                return jsonify({"error": "Forbidden"}), 403
+            return view(*args, **kwargs)
+        return wrapper
+    return decorate
+
 @app.route("/api/auth/register", methods=["POST"])
 def register():
     data = request.get_json()
@@ -268,24 +769,137 @@ def register():
     db.execute("INSERT INTO users (id,name,email,password_hash,role) VALUES (?,?,?,?,?)",
                 (uid, name, email, generate_password_hash(password), role))
     db.commit()
-    return jsonify({"user": {"id": uid, "name": name, "email": email, "role": role}}), 201
+    user = {"id": uid, "name": name, "email": email, "role": role}
+    identity_cache.put(uid, user)
+    return auth_response(user, 201)
 
 @app.route("/api/auth/login", methods=["POST"])
 def login():
     data = request.get_json()
     email, password, role = data.get("email"), data.get("password"), data.get("role")
     db = get_db()
-    user = db.execute("SELECT * FROM users WHERE email=? AND role=?", (email, role)).fetchone()
+    user = db.execute("SELECT id, name, email, role, password_hash FROM users WHERE email=? AND role=?", (email, role)).fetchone()
     if user and check_password_hash(user["password_hash"], password):
-        return jsonify({"user": dict(user)}), 200
+        user = {key: user[key] for key in ("id", "name", "email", "role")}
+        identity_cache.put(user["id"], user)
+        return auth_response(user, 200)
     return jsonify({"error": "Invalid credentials"}), 401
 
+# -------------------------------------------------------------------------
+# Skill Taxonomy
+# -------------------------------------------------------------------------
+@app.route("/api/skills", methods=["GET"])
+def get_skills():
+    db = get_db()
+    rows = db.execute("""
+        SELECT s.name, a.alias
+        FROM skills s
+        LEFT JOIN skill_aliases a ON a.skill = s.name
+        ORDER BY s.name, a.alias
+    """).fetchall()
+
+    skills = {}
+    for row in rows:
+        skill = skills.setdefault(row["name"], {"name": row["name"], "aliases": []})
+        if row["alias"]:
+            skill["aliases"].append(row["alias"])
+    return jsonify({"skills": list(skills.values())})
+
+@app.route("/api/skills", methods=["POST"])
+@authenticated
+@role_required("recruiter")
+def add_skill():
+    global skill_matcher_checked
+    data = request.get_json()
+    name = (data.get("name") or "").strip()
+    aliases = [a.strip() for a in data.get("aliases", []) if a and a.strip()]
+    if not name:
+        return jsonify({"error": "Missing skill name"}), 400
+
+    db = get_db()
+    db.execute("INSERT OR IGNORE INTO skills (name) VALUES (?)", (name,))
+    db.executemany("INSERT OR REPLACE INTO skill_aliases (alias, skill) VALUES (?,?)",
+                   [(alias, name) for alias in aliases])
+    db.commit()
+
+    # Rebuild the matcher now and re-extract skills for the jobs it can affect
+    skill_matcher_checked = float("-inf")
+    reindex_jobs_mentioning([name, *aliases])
+    return jsonify({"skill": {"name": name, "aliases": aliases}}), 201
+
 # -------------------------------------------------------------------------
 # Companies & Jobs
 # -------------------------------------------------------------------------
+catalog_cache = ResponseCache(app.config["CATALOG_CACHE_ENTRIES"])
+catalog_generation = None
+catalog_checked = float("-inf")
+
+def get_catalog_generation():
+    """
+    Return (version, last_modified) of the job/company catalog. The DB is
+    re-read at most every CATALOG_CHECK_SECONDS, so conditional requests in
+    between are answered without touching it.
+    """
+    global catalog_generation, catalog_checked
+    now = time.monotonic()
+    if catalog_generation is None or now - catalog_checked >= app.config["CATALOG_CHECK_SECONDS"]:
+        row = get_db().execute("SELECT version, updated_at FROM catalog_version WHERE id=1").fetchone()
+        updated = datetime.strptime(row["updated_at"], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+        catalog_generation = (row["version"], updated)
+        catalog_checked = now
+    return catalog_generation
+
+def invalidate_catalog():
+    # Our own writes are visible immediately; other workers catch up on their next check
+    global catalog_checked
+    catalog_checked = float("-inf")
+
+def catalog_cached(view):
+    """
+    Serve a catalog GET from the response cache with ETag/Last-Modified,
+    answering matching conditional requests with 304.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        version, last_modified = get_catalog_generation()
+        key = request.full_path
+        etag = f"{version}-{hashlib.sha1(key.encode()).hexdigest()[:12]}"
+
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains(etag)
+        else:
+            since = request.if_modified_since
+            not_modified = since is not None and last_modified <= since
+        if not_modified:
+            catalog_cache.not_modified += 1
+            response = Response(status=304)
+        else:
+            body = catalog_cache.get(key, version)
+            if body is None:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                catalog_cache.put(key, version, response.get_data())
+            else:
+                response = Response(body, mimetype="application/json")
+
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    return wrapper
+
+@app.route("/api/catalog/cache", methods=["GET"])
+def catalog_cache_stats():
+    version, last_modified = get_catalog_generation()
+    return jsonify({"cache": catalog_cache.stats(), "version": version, "lastModified": last_modified.isoformat()})
+
 @app.route("/api/companies", methods=["GET"])
+@catalog_cached
 def get_companies():
     db = get_db()
+    if "limit" in request.args:
+        return get_companies_page(db)
     rows = db.execute("""
         SELECT c.id as company_id, c.name as company_name, 
                j.id as job_id, j.title as job_title
@@ -303,7 +917,24 @@ def get_companies():
             companies[cid]["jobRoles"].append({"id": row["job_id"], "title": row["job_title"]})
 
     return jsonify({"companies": list(companies.values())})
+
+def get_companies_page(db):
+    # Page over companies, then attach the job roles of just that page
+    page, next_cursor = fetch_page(db, "id, name", "companies")
+    companies = {c["id"]: {"id": c["id"], "name": c["name"], "jobRoles": []} for c in page}
+    if companies:
+        placeholders = ",".join("?" * len(companies))
+        jobs = db.execute(
+            f"SELECT id, title, company_id FROM jobs WHERE company_id IN ({placeholders}) ORDER BY title",
+            list(companies),
+        ).fetchall()
+        for job in jobs:
+            companies[job["company_id"]]["jobRoles"].append({"id": job["id"], "title": job["title"]})
+    return paged_response("companies", list(companies.values()), next_cursor)
+
 @app.route("/api/jobs", methods=["POST"])
+@authenticated
+@role_required("recruiter")
 def add_or_update_job():
     data = request.get_json()
     title = data.get("title")
@@ -336,7 +967,9 @@ def add_or_update_job():
             "UPDATE jobs SET description=?, requirements=?, location=? WHERE id=?",
             (description, requirements, location, existing["id"])
         )
+        index_job_skills(db, existing["id"], description, requirements)
         db.commit()
+        invalidate_catalog()
         return jsonify({"message": "Job description updated", "jobId": existing["id"]}), 200
     else:
         job_id = str(uuid.uuid4())
@@ -344,20 +977,205 @@ def add_or_update_job():
             "INSERT INTO jobs (id, title, description, requirements, location, company_id) VALUES (?,?,?,?,?,?)",
             (job_id, title, description, requirements, location, company_id)
         )
+        index_job_skills(db, job_id, description, requirements)
         db.commit()
+        invalidate_catalog()
         return jsonify({"message": "Job added successfully", "jobId": job_id}), 201
+
+BULK_JOB_FIELDS = ("title", "description", "companyName", "requirements", "location")
+
+def iter_bulk_job_records():
+    """
+    Yield (record number, dict or error message) from the request body: a
+    JSON array (or {"jobs": [...]}), or NDJSON / CSV read line by line so
+    large feeds are never held in memory whole.
+    """
+    mimetype = request.mimetype
+    if mimetype in ("application/x-ndjson", "application/jsonl"):
+        lines = io.TextIOWrapper(io.BufferedReader(request.stream), encoding="utf-8")
+        number = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                yield number, f"Invalid JSON: {e}"
+    elif mimetype == "text/csv":
+        lines = io.TextIOWrapper(io.BufferedReader(request.stream), encoding="utf-8", newline="")
+        for number, row in enumerate(csv.DictReader(lines), 1):
+            yield number, row
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get("jobs")
+        if not isinstance(data, list):
+            abort(400, "Expected a JSON array of jobs, NDJSON or CSV")
+        yield from enumerate(data, 1)
+
+def upsert_job_batch(db, batch, company_ids):
+    """
+    Upsert one batch of validated jobs in a single transaction. Companies
+    missing from the name -> id map are created. Returns (inserted, updated).
+    """
+    new_companies = {}
+    for job in batch:
+        name = job["companyName"]
+        if name not in company_ids and name not in new_companies:
+            new_companies[name] = str(uuid.uuid4())
+    db.executemany("INSERT INTO companies (id, name) VALUES (?, ?)", [(cid, name) for name, cid in new_companies.items()])
+
+    # Existing ids for the batch's (company_id, title) keys tell inserts from updates
+    keys = {(company_ids.get(job["companyName"]) or new_companies[job["companyName"]], job["title"]) for job in batch}
+    existing = {}
+    key_list = list(keys)
+    for start in range(0, len(key_list), 400):
+        chunk = key_list[start:start + 400]
+        placeholders = ",".join("(?,?)" for _ in chunk)
+        rows = db.execute(
+            f"SELECT id, company_id, title FROM jobs WHERE (company_id, title) IN (VALUES {placeholders})",
+            [value for key in chunk for value in key],
+        ).fetchall()
+        existing.update({(row["company_id"], row["title"]): row["id"] for row in rows})
+
+    rows, indexed = [], {}
+    inserted = updated = 0
+    for job in batch:
+        company_id = company_ids.get(job["companyName"]) or new_companies[job["companyName"]]
+        key = (company_id, job["title"])
+        if key in existing:
+            updated += 1
+        else:
+            inserted += 1
+            existing[key] = str(uuid.uuid4())
+        job_id = existing[key]
+        rows.append((job_id, job["title"], job["description"], job.get("requirements"), job.get("location"), company_id))
+        indexed[job_id] = (job_id, job["description"], job.get("requirements"))
+
+    db.executemany("""
+        INSERT INTO jobs (id, title, description, requirements, location, company_id) VALUES (?,?,?,?,?,?)
+        ON CONFLICT (company_id, title) DO UPDATE SET
+            description = excluded.description,
+            requirements = excluded.requirements,
+            location = excluded.location
+    """, rows)
+    index_jobs_skills(db, list(indexed.values()))
+    db.commit()
+    company_ids.update(new_companies)
+    return inserted, updated
+
+@app.route("/api/jobs/bulk", methods=["POST"])
+@authenticated
+@role_required("recruiter")
+@body_limit("BULK_MAX_BYTES")
+def bulk_import_jobs():
+    """
+    Import many jobs at once. Each record has the same fields as POST
+    /api/jobs; a job whose company and title already exist is updated.
+    Records are upserted in batches of BULK_BATCH_SIZE, one transaction each.
+    A streamed body cut off at BULK_MAX_BYTES still gets its counts back,
+    with a 413, since the batches before the cut are already committed.
+    """
+    db = get_db()
+    company_ids = {row["name"]: row["id"] for row in db.execute("SELECT id, name FROM companies")}
+    batch_size = app.config["BULK_BATCH_SIZE"]
+    inserted = updated = failed = 0
+    errors = []
+
+    def fail(number, message):
+        nonlocal failed
+        failed += 1
+        if len(errors) < 100:
+            errors.append({"record": number, "error": message})
+
+    def flush(batch):
+        nonlocal inserted, updated
+        if not batch:
+            return
+        try:
+            added, changed = upsert_job_batch(db, [job for _, job in batch], company_ids)
+            inserted += added
+            updated += changed
+        except sqlite3.Error as e:
+            db.rollback()
+            for number, _ in batch:
+                fail(number, f"Database error: {e}")
+
+    batch = []
+    too_large = None
+    try:
+        for number, record in iter_bulk_job_records():
+            if isinstance(record, str):
+                fail(number, record)
+                continue
+            if not isinstance(record, dict):
+                fail(number, "Expected an object")
+                continue
+            job = {field: (str(record[field]).strip() if record.get(field) is not None else None) for field in BULK_JOB_FIELDS}
+            if not all([job["title"], job["description"], job["companyName"]]):
+                fail(number, "Missing required fields")
+                continue
+            batch.append((number, job))
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+    except RequestEntityTooLarge as e:
+        too_large = e
+    flush(batch)
+
+    if inserted or updated:
+        invalidate_catalog()
+    body = {"inserted": inserted, "updated": updated, "failed": failed, "errors": errors}
+    if too_large:
+        body["error"] = f"Body exceeds the {app.config['BULK_MAX_BYTES']} byte limit; records after it were not read"
+        return jsonify(body), 413
+    return jsonify(body)
+
 @app.route("/api/jobs", methods=["GET"])
+@catalog_cached
 def get_jobs():
     db = get_db()
+    jobs, next_cursor = fetch_page(
+        db,
+        "j.id, j.title, j.description, j.requirements, j.location, c.name as company_name",
+        "jobs j JOIN companies c ON j.company_id = c.id",
+        created_col="j.created_at", id_col="j.id",
+    )
+    return paged_response("jobs", jobs, next_cursor)
+
+@app.route("/api/jobs/search", methods=["GET"])
+@catalog_cached
+def search_jobs():
+    """
+    Ranked full-text job search over title, description, requirements and
+    company name (jobs_fts). Every word in ?q= must match, the last one as
+    a prefix so search-as-you-type works.
+    """
+    terms = re.findall(r"\w+", request.args.get("q", ""))
+    if not terms:
+        return jsonify({"error": "Missing search query"}), 400
+    match = " ".join(f'"{t}"' for t in terms) + "*"
+    limit = max(1, min(request.args.get("limit", 20, type=int) or 20, app.config["PAGE_MAX_LIMIT"]))
+
+    db = get_db()
+    # bm25 column weights: title, description, requirements, company name
     rows = db.execute("""
-        SELECT j.id, j.title, j.description, j.requirements, j.location,
-               c.name as company_name
-        FROM jobs j
-        JOIN companies c ON j.company_id = c.id
-    """).fetchall()
-    return jsonify({"jobs": [dict(r) for r in rows]})
+        SELECT j.id, j.title, j.requirements, j.location, c.name AS company_name,
+               bm25(jobs_fts, 10.0, 1.0, 3.0, 5.0) AS rank,
+               snippet(jobs_fts, -1, '<mark>', '</mark>', '…', 16) AS snippet
+        FROM jobs_fts
+        JOIN jobs_fts_ids f ON f.seq = jobs_fts.rowid
+        JOIN jobs j ON j.id = f.job_id
+        LEFT JOIN companies c ON c.id = j.company_id
+        WHERE jobs_fts MATCH ?
+        ORDER BY rank
+        LIMIT ?
+    """, (match, limit)).fetchall()
+    return jsonify({"jobs": [dict(r) for r in rows], "query": " ".join(terms)})
 
 @app.route("/api/jobs/<job_id>", methods=["GET"])
+@catalog_cached
 def get_job_details(job_id):
     db = get_db()
     job = db.execute("""
@@ -374,70 +1192,38 @@ def get_job_details(job_id):
 # -------------------------------------------------------------------------
 # Resume Screening (Multiple Resumes)
 # -------------------------------------------------------------------------
-@app.route("/api/resume/screen", methods=["POST"])
-def screen_resumes():
-    """
-    Screen multiple resumes against a job description.
-    Returns candidates with ATS scores and shortlisting status.
-    """
-    print("DEBUG: Resume screening endpoint called")
-    job_desc = request.form.get("jobDescription", "")
-    resume_files = request.files.getlist("resumes")
-    print(f"DEBUG: Job description: {job_desc}")
-    print(f"DEBUG: Resume files count: {len(resume_files)}")
-    
-    if not resume_files or not job_desc:
-        return jsonify({"error": "Missing job description or resume files"}), 400
-    
-    candidates = []
-    
-    for resume_file in resume_files:
-        if not allowed_file(resume_file.filename):
-            continue
-            
-        filename = secure_filename(resume_file.filename)
-        file_path = os.path.join(app.config["UPLOAD_FOLDER"], f"{uuid.uuid4()}_{filename}")
-        resume_file.save(file_path)
-        
-        try:
-            # Parse resume text
-            resume_text = parse_resume(file_path)
-            
-            # Analyze resume against job description
-            analysis = analyze_resume_logic(resume_text, job_desc)
-            
-            # Extract candidate name from filename (remove extension)
-            candidate_name = filename.rsplit('.', 1)[0].replace('_', ' ').title()
-            
-            # Create candidate object
-            candidate = {
-                "name": candidate_name,
-                "email": f"{candidate_name.lower().replace(' ', '.')}@email.com",  # Placeholder email
-                "score": analysis["score"],
-                "matchedSkills": analysis["skillsFound"],
-                "missingSkills": analysis["skillsMissing"],
-                "fileName": filename,
-                "isShortlisted": analysis["score"] >= 70
-            }
-            
-            candidates.append(candidate)
-            
-        except Exception as e:
-            print(f"Error processing {filename}: {e}")
-            continue
-        finally:
-            # Clean up uploaded file
-            if os.path.exists(file_path):
-                os.remove(file_path)
+def build_candidate(filename, entry, job_desc):
+    """Score one parsed resume ({"text", "skills"}) against a job description."""
+    # Analyze resume against job description
+    analysis = analyze_resume_logic(entry["text"], job_desc, entry["skills"])
+    return candidate_record(filename, analysis, entry.get("partial", False))
+
+def candidate_record(filename, analysis, partial=False):
+    # Extract candidate name from filename (remove extension)
+    candidate_name = filename.rsplit('.', 1)[0].replace('_', ' ').title()
     
+    # Create candidate object
+    return {
+        "name": candidate_name,
+        "email": f"{candidate_name.lower().replace(' ', '.')}@email.com",  # Placeholder email
+        "score": analysis["score"],
+        "matchedSkills": analysis["skillsFound"],
+        "missingSkills": analysis["skillsMissing"],
+        "fileName": filename,
+        "isShortlisted": analysis["score"] >= 70,
+        "partialParse": partial,
+    }
+
+def rank_candidates(candidates):
+    """Sort candidates by score and split them into shortlisted/rejected with a summary."""
     # Sort candidates by score (highest first)
-    candidates.sort(key=lambda x: x["score"], reverse=True)
+    candidates = sorted(candidates, key=lambda x: x["score"], reverse=True)
     
     # Separate shortlisted and rejected candidates
     shortlisted = [c for c in candidates if c["isShortlisted"]]
     rejected = [c for c in candidates if not c["isShortlisted"]]
     
-    return jsonify({
+    return {
         "candidates": candidates,
         "shortlisted": shortlisted,
         "rejected": rejected,
@@ -447,7 +1233,393 @@ def screen_resumes():
             "rejected": len(rejected),
             "shortlistRate": round((len(shortlisted) / len(candidates)) * 100, 1) if candidates else 0
         }
-    })
+    }
+
+def screen_uploads(job_desc, uploads, pool=None, dedupe=False):
+    """
+    Parse and score a list of (filename, data) uploads. Returns one candidate
+    per upload, or None where processing failed. With `pool`, the parsed
+    resumes are also saved to that candidate pool. With `dedupe`, duplicates
+    are folded into their original's `duplicates` and come back as None.
+    """
+    copies = {}
+    if dedupe:
+        uploads, copies = drop_exact_duplicates(uploads)
+    # Parse all uncached resumes in parallel on the parsing pool
+    entries = parse_resumes_cached([(data, upload_ext(filename)) for filename, data in uploads])
+
+    candidates = [None] * len(uploads)
+    kept = []
+    for i, entry, candidate in fold_duplicates(job_desc, uploads, enumerate(entries), copies, dedupe):
+        if entry is not None:
+            candidates[i] = candidate
+            kept.append((uploads[i], entry))
+    if pool:
+        save_pool_candidates(pool, [upload for upload, _ in kept], [entry for _, entry in kept])
+    return candidates
+
+def drop_exact_duplicates(uploads):
+    """
+    Keep the first of each set of byte-identical (filename, data) uploads.
+    Returns the kept uploads and {kept index: [filenames of its copies]}.
+    """
+    kept, seen, copies = [], {}, {}
+    for filename, data in uploads:
+        key = resume_cache.key(data)
+        if key in seen:
+            copies.setdefault(seen[key], []).append(filename)
+        else:
+            seen[key] = len(kept)
+            kept.append((filename, data))
+    return kept, copies
+
+def fold_duplicates(job_desc, uploads, parsed, copies=None, dedupe=False):
+    """
+    Score (index, entry) pairs in the order given and yield (index, entry,
+    candidate); candidate is None where scoring failed. With `dedupe`, a
+    text that nearly duplicates one scored earlier is appended to that
+    candidate's `duplicates` and yielded as (index, None, duplicate record).
+    `copies` lists the byte-identical files dropped before parsing.
+    """
+    copies = copies or {}
+    near = None
+    if dedupe and app.config["DEDUPE_SIMILARITY"]:
+        from dedupe import NearDuplicateIndex
+        near = NearDuplicateIndex(app.config["DEDUPE_SIMILARITY"])
+    exact = lambda i: [{"fileName": name, "match": "exact", "similarity": 1.0} for name in copies.get(i, [])]
+
+    originals = {}
+    for i, entry in parsed:
+        filename = uploads[i][0]
+        match = near.add(i, entry["text"]) if near else None
+        if match and match[0] in originals:
+            original, similarity = match
+            duplicate = {"fileName": filename, "match": "near", "similarity": round(similarity, 3)}
+            originals[original]["duplicates"] += [duplicate] + exact(i)
+            yield i, None, {**duplicate, "duplicateOf": uploads[original][0]}
+            continue
+
+        try:
+            candidate = build_candidate(filename, entry, job_desc)
+        except Exception as e:
+            print(f"Error processing {filename}: {e}")
+            yield i, entry, None
+            continue
+        if dedupe:
+            candidate["duplicates"] = exact(i)
+            originals[i] = candidate
+        yield i, entry, candidate
+
+def collect_resume_uploads():
+    """Read the allowed files from the `resumes` form field as (filename, data) pairs."""
+    uploads = []
+    for resume_file in request.files.getlist("resumes"):
+        if not allowed_file(resume_file.filename):
+            continue
+        uploads.append((secure_filename(resume_file.filename), read_upload(resume_file)))
+    return uploads
+
+@app.route("/api/resume/screen", methods=["POST"])
+@authenticated
+@role_required("recruiter")
+def screen_resumes():
+    """
+    Screen multiple resumes against a job description.
+    Returns candidates with ATS scores and shortlisting status.
+    A `pool` form field also saves the candidates to that named pool.
+    Duplicate resumes are folded into one candidate unless `dedupe=false`.
+    """
+    job_desc = request.form.get("jobDescription", "")
+    resume_files = request.files.getlist("resumes")
+    pool = request.form.get("pool", "").strip() or None
+    dedupe = request.form.get("dedupe", "true").lower() not in ("false", "0", "no")
+    
+    if not resume_files or not job_desc:
+        return jsonify({"error": "Missing job description or resume files"}), 400
+    
+    stream_format = screening_stream_format()
+    if stream_format:
+        return stream_screening(job_desc, collect_resume_uploads(), stream_format, pool, dedupe)
+
+    candidates = screen_uploads(job_desc, collect_resume_uploads(), pool, dedupe)
+    result = rank_candidates([c for c in candidates if c])
+    if dedupe:
+        result["summary"]["duplicates"] = sum(len(c["duplicates"]) for c in result["candidates"])
+    if pool:
+        result["pool"] = pool_summary(get_db(), pool_name=pool)
+    return jsonify(result)
+
+def screening_stream_format():
+    """
+    Streaming is opt-in: ?stream=ndjson|sse (or a `stream` form field), or
+    an Accept header of application/x-ndjson or text/event-stream.
+    """
+    fmt = request.args.get("stream") or request.form.get("stream")
+    if fmt in ("ndjson", "sse"):
+        return fmt
+    best = request.accept_mimetypes.best
+    if best == "application/x-ndjson":
+        return "ndjson"
+    if best == "text/event-stream":
+        return "sse"
+    return None
+
+def stream_screening(job_desc, uploads, stream_format, pool=None, dedupe=False):
+    """
+    Send one record per candidate as soon as it is scored, then a final
+    summary record. NDJSON lines are {"type": ..., ...}; SSE uses the type
+    as the event name. With `pool`, candidates are saved before the summary.
+    With `dedupe`, a near-duplicate of a candidate already sent is sent as a
+    "duplicate" record instead.
+    """
+    def encode(seq, record_type, payload):
+        if stream_format == "sse":
+            return f"id: {seq}\nevent: {record_type}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps({"type": record_type, **payload}) + "\n"
+
+    copies = {}
+    if dedupe:
+        uploads, copies = drop_exact_duplicates(uploads)
+
+    def generate():
+        candidates = []
+        kept = []
+        duplicates = sum(len(names) for names in copies.values())
+        parsed = iter_parse_resumes_cached([(data, upload_ext(filename)) for filename, data in uploads])
+        for seq, (i, entry, candidate) in enumerate(fold_duplicates(job_desc, uploads, parsed, copies, dedupe)):
+            if entry is None:
+                duplicates += 1
+                yield encode(seq, "duplicate", {"duplicate": candidate})
+                continue
+            kept.append((uploads[i], entry))
+            if candidate is None:
+                continue
+            candidates.append(candidate)
+            yield encode(seq, "candidate", {"candidate": candidate})
+
+        ranked = rank_candidates(candidates)
+        if dedupe:
+            ranked["summary"]["duplicates"] = duplicates
+        summary = {
+            "summary": ranked["summary"],
+            "ranking": [c["fileName"] for c in ranked["candidates"]],
+        }
+        if pool:
+            save_pool_candidates(pool, [upload for upload, _ in kept], [entry for _, entry in kept])
+            summary["pool"] = pool_summary(get_db(), pool_name=pool)
+        yield encode(len(uploads), "summary", summary)
+
+    mimetype = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# -------------------------------------------------------------------------
+# Bulk Screening Jobs (background queue)
+# -------------------------------------------------------------------------
+def screen_batch_in_context(job_desc, uploads):
+    # Runs on the screening worker thread, outside any request. Yields each
+    # file as soon as it is scored so the queue can record progress per file.
+    with app.app_context():
+        parsed = iter_parse_resumes_cached([(data, upload_ext(filename)) for filename, data in uploads])
+        for i, _, candidate in fold_duplicates(job_desc, uploads, parsed):
+            yield i, candidate
+
+screening_queue = ScreeningQueue(
+    DATABASE,
+    screen_batch_in_context,
+    batch_size=app.config["SCREENING_BATCH_SIZE"],
+    # Progress is recorded per file and one parse can take up to ~2x PARSE_TIMEOUT
+    stale_after=max(300, 4 * app.config["PARSE_TIMEOUT"]),
+)
+
+@app.route("/api/resume/screen/jobs", methods=["POST"])
+@authenticated
+@role_required("recruiter")
+def submit_screening_job():
+    """Queue a resume batch for background screening and return its id immediately."""
+    job_desc = request.form.get("jobDescription", "")
+    uploads = collect_resume_uploads()
+    if not uploads or not job_desc:
+        return jsonify({"error": "Missing job description or resume files"}), 400
+
+    job_id = screening_queue.submit(job_desc, uploads)
+    return jsonify({"screeningJobId": job_id, "status": "queued", "total": len(uploads)}), 202
+
+@app.route("/api/resume/screen/jobs/<job_id>", methods=["GET"])
+@authenticated
+@role_required("recruiter")
+def get_screening_job(job_id):
+    """Progress of a screening job plus the candidates ranked so far."""
+    job = screening_queue.get(job_id)
+    if not job:
+        return jsonify({"error": "Screening job not found"}), 404
+
+    # Make sure this process has a worker running, e.g. after a restart
+    screening_queue.start()
+    result = rank_candidates(screening_queue.results(job_id))
+    result["job"] = {
+        "id": job["id"],
+        "status": job["status"],
+        "total": job["total"],
+        "processed": job["processed"],
+        "failed": job["failed"],
+        "progress": round(job["processed"] / job["total"] * 100, 1) if job["total"] else 100,
+        "createdAt": job["created_at"],
+        "updatedAt": job["updated_at"],
+    }
+    return jsonify(result)
+
+@app.route("/api/resume/screen/jobs/<job_id>/cancel", methods=["POST"])
+@authenticated
+@role_required("recruiter")
+def cancel_screening_job(job_id):
+    if not screening_queue.get(job_id):
+        return jsonify({"error": "Screening job not found"}), 404
+    if not screening_queue.cancel(job_id):
+        return jsonify({"error": "Screening job already finished"}), 409
+    return jsonify({"success": True, "status": "cancelled"})
+
+# -------------------------------------------------------------------------
+# Candidate Pools
+# -------------------------------------------------------------------------
+def save_pool_candidates(pool_name, uploads, entries):
+    """
+    Store parsed (filename, data) uploads and their skills in the named pool,
+    creating it on first use. A resume already in the pool is replaced;
+    failed parses are skipped.
+    """
+    db = get_db()
+    db.execute("INSERT INTO candidate_pools (id, name) VALUES (?, ?) ON CONFLICT (name) DO NOTHING",
+               (str(uuid.uuid4()), pool_name))
+    pool_id = db.execute("SELECT id FROM candidate_pools WHERE name=?", (pool_name,)).fetchone()["id"]
+    db.executemany("""
+        INSERT INTO pool_candidates (pool_id, resume_key, file_name, skills, taxonomy_version, partial)
+        VALUES (?,?,?,?,?,?)
+        ON CONFLICT (pool_id, resume_key) DO UPDATE SET
+            file_name = excluded.file_name,
+            skills = excluded.skills,
+            taxonomy_version = excluded.taxonomy_version,
+            partial = excluded.partial,
+            added_at = CURRENT_TIMESTAMP
+    """, [
+        (pool_id, resume_cache.key(data), filename, json.dumps(entry["skills"]),
+         entry["version"], int(entry.get("partial", False)))
+        for (filename, data), entry in zip(uploads, entries)
+        if entry and entry["text"]
+    ])
+    db.commit()
+
+def pool_summary(db, pool_id=None, pool_name=None):
+    row = db.execute("""
+        SELECT p.id, p.name, p.created_at, COUNT(c.resume_key) AS size
+        FROM candidate_pools p
+        LEFT JOIN pool_candidates c ON c.pool_id = p.id
+        WHERE p.id = ? OR p.name = ?
+        GROUP BY p.id
+    """, (pool_id, pool_name)).fetchone()
+    if row is None:
+        return None
+    return {"id": row["id"], "name": row["name"], "size": row["size"], "createdAt": row["created_at"]}
+
+def load_pool_candidates(db, pool_id):
+    """
+    Stored candidates of a pool as {"fileName", "skills", "partial"}. Skills
+    extracted under an older taxonomy are refreshed from the resume cache
+    when it still has the text.
+    """
+    version = get_skill_matcher().version
+    rows = db.execute("""
+        SELECT resume_key, file_name, skills, taxonomy_version, partial
+        FROM pool_candidates WHERE pool_id=? ORDER BY added_at, file_name
+    """, (pool_id,)).fetchall()
+
+    candidates, refreshed = [], []
+    for row in rows:
+        skills = json.loads(row["skills"])
+        if row["taxonomy_version"] != version:
+            entry = resume_cache.get(row["resume_key"])
+            if entry is not None:
+                skills = refresh_cached_skills(row["resume_key"], entry)["skills"]
+                refreshed.append((json.dumps(skills), version, pool_id, row["resume_key"]))
+        candidates.append({"fileName": row["file_name"], "skills": skills, "partial": bool(row["partial"])})
+
+    if refreshed:
+        db.executemany("UPDATE pool_candidates SET skills=?, taxonomy_version=? WHERE pool_id=? AND resume_key=?", refreshed)
+        db.commit()
+    return candidates
+
+@app.route("/api/candidate-pools", methods=["GET"])
+@authenticated
+@role_required("recruiter")
+def list_candidate_pools():
+    db = get_db()
+    rows = db.execute("""
+        SELECT p.id, p.name, p.created_at, COUNT(c.resume_key) AS size
+        FROM candidate_pools p
+        LEFT JOIN pool_candidates c ON c.pool_id = p.id
+        GROUP BY p.id
+        ORDER BY p.created_at DESC, p.name
+    """).fetchall()
+    return jsonify({"pools": [
+        {"id": row["id"], "name": row["name"], "size": row["size"], "createdAt": row["created_at"]}
+        for row in rows
+    ]})
+
+@app.route("/api/candidate-pools/<pool_id>", methods=["GET"])
+@authenticated
+@role_required("recruiter")
+def get_candidate_pool(pool_id):
+    db = get_db()
+    pool = pool_summary(db, pool_id=pool_id)
+    if not pool:
+        return jsonify({"error": "Candidate pool not found"}), 404
+    return jsonify({"pool": pool, "candidates": load_pool_candidates(db, pool_id)})
+
+@app.route("/api/candidate-pools/<pool_id>", methods=["DELETE"])
+@authenticated
+@role_required("recruiter")
+def delete_candidate_pool(pool_id):
+    db = get_db()
+    if not pool_summary(db, pool_id=pool_id):
+        return jsonify({"error": "Candidate pool not found"}), 404
+    db.execute("DELETE FROM pool_candidates WHERE pool_id=?", (pool_id,))
+    db.execute("DELETE FROM candidate_pools WHERE id=?", (pool_id,))
+    db.commit()
+    return jsonify({"success": True})
+
+@app.route("/api/candidate-pools/<pool_id>/rescore", methods=["POST"])
+@authenticated
+@role_required("recruiter")
+def rescore_candidate_pool(pool_id):
+    """
+    Re-rank a stored pool against a new `jobDescription` or an existing
+    `jobId`, using only the stored skills: nothing is uploaded or parsed.
+    Returns the same shape as /api/resume/screen.
+    """
+    data = request.get_json(silent=True) or {}
+    db = get_db()
+    pool = pool_summary(db, pool_id=pool_id)
+    if not pool:
+        return jsonify({"error": "Candidate pool not found"}), 404
+
+    if data.get("jobId"):
+        if not db.execute("SELECT 1 FROM jobs WHERE id=?", (data["jobId"],)).fetchone():
+            return jsonify({"error": "Job not found"}), 404
+        job_skills = [row["skill"] for row in db.execute("SELECT skill FROM job_skills WHERE job_id=?", (data["jobId"],))]
+    elif data.get("jobDescription"):
+        job_skills = extract_skills_from_text(data["jobDescription"])
+    else:
+        return jsonify({"error": "jobDescription or jobId is required"}), 400
+
+    result = rank_candidates([
+        candidate_record(c["fileName"], skill_analysis(c["skills"], job_skills), c["partial"])
+        for c in load_pool_candidates(db, pool_id)
+    ])
+    result["pool"] = pool
+    return jsonify(result)
 
 # -------------------------------------------------------------------------
 # Resume Job Finding
@@ -460,43 +1632,96 @@ def job_finding_api():
     if not resume_file or not allowed_file(resume_file.filename):
         return jsonify({"error": "Invalid or missing resume file"}), 400
 
-    filename = secure_filename(resume_file.filename)
-    file_path = os.path.join(app.config["UPLOAD_FOLDER"], f"{uuid.uuid4()}_{filename}")
-    resume_file.save(file_path)
+    entry = parse_resume_cached(read_upload(resume_file), upload_ext(resume_file.filename))
+    resume_text = entry["text"]
 
-    resume_text = parse_resume(file_path)
-    os.remove(file_path)
+    analysis = analyze_resume_logic(resume_text, job_desc, entry["skills"])
 
-    analysis = analyze_resume_logic(resume_text, job_desc)
+    # Clamped: a negative LIMIT means "no limit" to SQLite
+    limit = request.form.get("limit", app.config["JOB_FINDING_LIMIT"], type=int) or app.config["JOB_FINDING_LIMIT"]
+    limit = max(1, min(limit, app.config["PAGE_MAX_LIMIT"]))
+    mode = request.form.get("mode", "skills")
+    if mode == "tfidf":
+        matched_jobs = find_jobs_by_tfidf(resume_text, limit)
+    elif mode == "skills":
+        matched_jobs = find_jobs_by_skills(entry["skills"], limit)
+    else:
+        return jsonify({"error": "mode must be 'skills' or 'tfidf'"}), 400
+
+    return jsonify({"jobFinding": {"analysis": analysis, "matchedJobs": matched_jobs},
+                    "partialParse": entry.get("partial", False)})
 
+def matched_job(job, score):
+    return {
+        "jobId": job["id"],
+        "title": job["title"],
+        "company": job["company_name"],
+        "industry": job["industry"],
+        "location": job["location"] or job["company_location"],
+        "score": score,
+        "requirements": job["requirements"]
+    }
+
+def find_jobs_by_skills(resume_skills, limit):
+    """
+    Top jobs by skill overlap, read from the job_skills index. Only jobs
+    sharing at least one skill with the resume are touched; the score
+    matches calculate_match_score (matched / job skills * 100).
+    """
+    if not resume_skills:
+        return []
     db = get_db()
-    jobs = db.execute("""
-        SELECT j.id, j.title, j.description, j.requirements, j.location,
+    placeholders = ",".join("?" * len(resume_skills))
+    rows = db.execute(f"""
+        WITH hits AS (
+            SELECT job_id, COUNT(*) AS matched
+            FROM job_skills
+            WHERE skill IN ({placeholders})
+            GROUP BY job_id
+        )
+        SELECT j.id, j.title, j.requirements, j.location,
+               c.name as company_name, c.industry, c.location as company_location,
+               h.matched * 100 / (SELECT COUNT(*) FROM job_skills t WHERE t.job_id = h.job_id) AS score
+        FROM hits h
+        JOIN jobs j ON j.id = h.job_id
+        JOIN companies c ON j.company_id = c.id
+        ORDER BY score DESC
+        LIMIT ?
+    """, (*resume_skills, limit)).fetchall()
+    return [matched_job(job, job["score"]) for job in rows]
+
+job_ranker = None
+
+def get_job_ranker():
+    global job_ranker
+    if job_ranker is None:
+        # numpy/scipy are only loaded once TF-IDF ranking is actually used
+        from ranking import TfidfIndex
+        job_ranker = TfidfIndex()
+    return job_ranker
+
+def find_jobs_by_tfidf(resume_text, limit):
+    """
+    Top jobs by TF-IDF cosine similarity between the full resume text and
+    each job's title, description and requirements (score 0-100).
+    """
+    db = get_db()
+    job_ranker = get_job_ranker()
+    job_ranker.sync(db)
+    ranked = job_ranker.top_k(resume_text, limit)
+    if not ranked:
+        return []
+
+    placeholders = ",".join("?" * len(ranked))
+    rows = db.execute(f"""
+        SELECT j.id, j.title, j.requirements, j.location,
                c.name as company_name, c.industry, c.location as company_location
         FROM jobs j
         JOIN companies c ON j.company_id = c.id
-    """).fetchall()
-
-    resume_skills = extract_skills_from_text(resume_text)
-    matched_jobs = []
-    for job in jobs:
-        job_text = f"{job['description']} {job['requirements'] or ''}"
-        job_skills = extract_skills_from_text(job_text)
-        score = calculate_match_score(resume_skills, job_skills)
-        if score > 0:
-            matched_jobs.append({
-                "jobId": job["id"],
-                "title": job["title"],
-                "company": job["company_name"],
-                "industry": job["industry"],
-                "location": job["location"] or job["company_location"],
-                "score": score,
-                "requirements": job["requirements"]
-            })
-
-    matched_jobs = sorted(matched_jobs, key=lambda x: x["score"], reverse=True)
-
-    return jsonify({"jobFinding": {"analysis": analysis, "matchedJobs": matched_jobs}})
+        WHERE j.id IN ({placeholders})
+    """, [job_id for job_id, _ in ranked]).fetchall()
+    jobs = {job["id"]: job for job in rows}
+    return [matched_job(jobs[job_id], round(score * 100)) for job_id, score in ranked if job_id in jobs]
 
 # -------------------------------------------------------------------------
 # Guides & Session Requests
@@ -508,6 +1733,7 @@ def get_guides():
     return jsonify([{"id": r["id"], "name": r["name"], "expertise":"General Guidance","email":r["email"]} for r in rows])
 
 @app.route("/api/request-session", methods=["POST"])
+@authenticated
 def request_session():
     try:
         data = request.get_json()
@@ -520,37 +1746,34 @@ def request_session():
         if not guide_id or not programmer_id:
             return jsonify({"error": "Missing fields"}), 400
 
-        db = get_db()
+        if not acting_as(programmer_id):
+            return jsonify({"error": "Forbidden"}), 403
 
         # ✅ check if guide exists
-        guide = db.execute(
-            "SELECT * FROM users WHERE id=? AND role='guide'", (guide_id,)
-        ).fetchone()
-        if not guide:
+        guide = get_identity(guide_id)
+        if not guide or guide["role"] != "guide":
             return jsonify({"error": "Guide not found"}), 404
 
         # ✅ check if programmer exists
-        programmer = db.execute(
-            "SELECT * FROM users WHERE id=? AND role='programmer'", (programmer_id,)
-        ).fetchone()
-        if not programmer:
+        programmer = get_identity(programmer_id)
+        if not programmer or programmer["role"] != "programmer":
             return jsonify({"error": "Programmer not found"}), 404
 
-        # ✅ insert session request (NOW with name + email)
-        request_id = str(uuid.uuid4())
-        db.execute(
-            "INSERT INTO session_requests (id, guide_id, programmer_id, programmer_name, programmer_email) VALUES (?,?,?,?,?)",
-            (request_id, guide_id, programmer_id, programmer["name"], programmer["email"]),
-        )
-        db.commit()
-
-        # ✅ notify the guide
-        message = f"You have a new session request from {programmer['name']}."
-        db.execute(
-            "INSERT INTO notifications (id, user_id, message) VALUES (?,?,?)",
-            (str(uuid.uuid4()), guide_id, message),
-        )
-        db.commit()
+        with unit_of_work() as db:
+            # ✅ insert session request (NOW with name + email)
+            request_id = str(uuid.uuid4())
+            db.execute(
+                "INSERT INTO session_requests (id, guide_id, programmer_id, programmer_name, programmer_email) VALUES (?,?,?,?,?)",
+                (request_id, guide_id, programmer_id, programmer["name"], programmer["email"]),
+            )
+
+            # ✅ notify the guide
+            message = f"You have a new session request from {programmer['name']}."
+            notify(
+                guide_id, message, "session_request",
+                requestId=request_id, programmerId=programmer_id,
+                programmerName=programmer["name"], programmerEmail=programmer["email"],
+            )
 
         return jsonify({"success": True, "message": f"Session requested with {guide['name']}!"}), 201
     except Exception as e:
@@ -559,7 +1782,10 @@ def request_session():
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
 @app.route("/api/session-requests/<guide_id>", methods=["GET"])
+@authenticated
 def get_session_requests(guide_id):
+    if not acting_as(guide_id):
+        return jsonify({"error": "Forbidden"}), 403
     try:
         db = get_db()
         rows = db.execute("""
@@ -574,6 +1800,7 @@ def get_session_requests(guide_id):
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route("/api/session-requests/<request_id>/update", methods=["POST"])
+@authenticated
 def update_session_request(request_id):
     try:
         data = request.get_json()
@@ -585,16 +1812,18 @@ def update_session_request(request_id):
             return jsonify({"error":"Invalid status"}), 400
 
         db = get_db()
-        req = db.execute("SELECT programmer_id FROM session_requests WHERE id=?", (request_id,)).fetchone()
+        req = db.execute("SELECT programmer_id, guide_id FROM session_requests WHERE id=?", (request_id,)).fetchone()
         if not req:
             return jsonify({"error":"Session request not found"}), 404
+        if not acting_as(req["guide_id"]):
+            return jsonify({"error": "Forbidden"}), 403
         
         programmer_id = req["programmer_id"]
 
-        db.execute("UPDATE session_requests SET status=? WHERE id=?", (new_status, request_id))
-        message = f"Your session request has been {new_status}."
-        db.execute("INSERT INTO notifications (id, user_id, message) VALUES (?,?,?)", (str(uuid.uuid4()), programmer_id, message))
-        db.commit()
+        with unit_of_work() as db:
+            db.execute("UPDATE session_requests SET status=? WHERE id=?", (new_status, request_id))
+            message = f"Your session request has been {new_status}."
+            notify(programmer_id, message, "session_request_updated", requestId=request_id, status=new_status)
         return jsonify({"success": True, "status": new_status})
     except Exception as e:
         print(f"Error in update_session_request: {e}")
@@ -603,26 +1832,235 @@ def update_session_request(request_id):
 # -------------------------------------------------------------------------
 # Notifications
 # -------------------------------------------------------------------------
+event_broker = EventBroker()
+stream_slots = threading.BoundedSemaphore(app.config["STREAM_MAX_CLIENTS"])
+
+def notification_event(row):
+    data = {
+        "id": row["id"],
+        "type": row["kind"] or "notification",
+        "message": row["message"],
+        "isRead": bool(row["is_read"]),
+        "createdAt": row["created_at"],
+    }
+    if row["payload"]:
+        data.update(json.loads(row["payload"]))
+    return {"id": row["seq"], "data": data}
+
+def publish_notifications(rows):
+    for row in rows:
+        event_broker.publish(row["user_id"], notification_event(row))
+
+notification_writer = NotificationWriter(
+    db_pool,
+    on_written=publish_notifications,
+    interval=app.config["NOTIFICATION_FLUSH_SECONDS"],
+    max_batch=app.config["NOTIFICATION_BATCH_SIZE"],
+)
+
+def notify(user_id, message, kind=None, **payload):
+    """
+    Queue a notification for the background writer, which inserts it and
+    publishes it to open streams. Inside a unit_of_work it is only queued
+    once the transaction commits.
+    """
+    after_commit(lambda: notification_writer.write(user_id, message, kind, payload))
+
+def latest_notification_id():
+    conn = db_pool.acquire()
+    try:
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM notifications").fetchone()[0]
+    finally:
+        db_pool.release(conn)
+
+def notification_events_since(user_id, last_id):
+    # Short-lived pool checkout: a stream must not pin a connection while it idles
+    conn = db_pool.acquire()
+    try:
+        rows = conn.execute(
+            """
+            SELECT seq, id, message, is_read, created_at, kind, payload FROM notifications
+            WHERE user_id=? AND seq > ? ORDER BY seq
+            """,
+            (user_id, last_id),
+        ).fetchall()
+        return [notification_event(row) for row in rows]
+    finally:
+        db_pool.release(conn)
+
+@app.route("/api/stream/<user_id>", methods=["GET"])
+@authenticated
+def stream_events(user_id):
+    """
+    Server-sent events for one user's notifications and session updates.
+    Each event's id is the notification's seq, so a reconnecting client
+    (EventSource sends Last-Event-ID itself, or pass ?lastEventId=) gets
+    whatever it missed replayed from the table before live events resume.
+    """
+    if not acting_as(user_id):
+        return jsonify({"error": "Forbidden"}), 403
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("lastEventId")
+    if last_id is not None:
+        try:
+            last_id = max(int(last_id), 0)
+        except ValueError:
+            abort(400, "Last-Event-ID must be an integer")
+
+    environ = request.environ
+    if environ.get("SERVER_SOFTWARE", "").startswith("gunicorn") and not environ.get("wsgi.multithread"):
+        # A sync worker would serve nothing else until the stream closes
+        return jsonify({
+            "error": "Event streams need a threaded worker (gunicorn -k gthread) or asgi.py; poll instead",
+        }), 503
+    if not stream_slots.acquire(blocking=False):
+        retry_after = max(1, int(app.config["STREAM_POLL_SECONDS"]))
+        response = jsonify({"error": "Too many open event streams", "retryAfter": retry_after})
+        response.headers["Retry-After"] = str(retry_after)
+        return response, 503
+
+    poll_seconds = app.config["STREAM_POLL_SECONDS"]
+    deadline = time.monotonic() + app.config["STREAM_MAX_SECONDS"]
+    retry_ms = app.config["STREAM_RETRY_MS"]
+
+    def render(event):
+        return f"id: {event['id']}\ndata: {json.dumps(event['data'])}\n\n"
+
+    def generate():
+        nonlocal last_id
+        # Subscribe before reading the table so nothing committed in between is lost
+        subscription = event_broker.subscribe(user_id)
+        try:
+            yield f"retry: {retry_ms}\n\n"
+            if last_id is None:
+                # New client: only events from now on
+                last_id = latest_notification_id()
+                events = []
+            else:
+                events = notification_events_since(user_id, last_id)
+            while True:
+                for event in events:
+                    last_id = event["id"]
+                    yield render(event)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                # The broker only wakes the stream early; events always come from
+                # the table so rows committed by other workers are never skipped
+                try:
+                    subscription.get(timeout=min(poll_seconds, remaining))
+                    while True:
+                        subscription.get_nowait()
+                except queue.Empty:
+                    pass
+                events = notification_events_since(user_id, last_id)
+                if not events:
+                    yield ": keep-alive\n\n"
+        finally:
+            event_broker.unsubscribe(user_id, subscription)
+
+    response = Response(stream_with_context(generate()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    # Runs when the server closes the response, even if it was never iterated
+    response.call_on_close(stream_slots.release)
+    return response
+
 @app.route("/api/notifications/<user_id>", methods=["GET"])
+@authenticated
 def get_notifications(user_id):
+    if not acting_as(user_id):
+        return jsonify({"error": "Forbidden"}), 403
     db = get_db()
-    rows = db.execute("SELECT id, message, is_read, created_at FROM notifications WHERE user_id=? ORDER BY created_at DESC", (user_id,)).fetchall()
-    return jsonify({"notifications": [dict(r) for r in rows]})
+    notifications, next_cursor = fetch_page(
+        db, "id, message, is_read, created_at", "notifications",
+        ["user_id=?"], [user_id], default_order="created_at DESC",
+    )
+    return paged_response("notifications", notifications, next_cursor)
+
+@app.route("/api/notifications/<user_id>/unread-count", methods=["GET"])
+@authenticated
+def get_unread_count(user_id):
+    if not acting_as(user_id):
+        return jsonify({"error": "Forbidden"}), 403
+    # Served from the partial index on unread rows
+    db = get_db()
+    count = db.execute("SELECT COUNT(*) FROM notifications WHERE user_id=? AND is_read=0", (user_id,)).fetchone()[0]
+    return jsonify({"unread": count})
 
 @app.route("/api/notifications/<notification_id>/read", methods=["POST"])
+@authenticated
 def mark_notification_read(notification_id):
     db = get_db()
-    notif = db.execute("SELECT * FROM notifications WHERE id=?", (notification_id,)).fetchone()
-    if not notif:
+    if g.identity:
+        cur = db.execute("UPDATE notifications SET is_read=1 WHERE id=? AND user_id=?",
+                         (notification_id, g.identity["id"]))
+    else:
+        cur = db.execute("UPDATE notifications SET is_read=1 WHERE id=?", (notification_id,))
+    if cur.rowcount == 0:
         return jsonify({"error": "Notification not found"}), 404
-    db.execute("UPDATE notifications SET is_read=1 WHERE id=?", (notification_id,))
     db.commit()
+    maybe_compact_notifications(db)
     return jsonify({"success": True})
 
+@app.route("/api/notifications/<user_id>/read-all", methods=["POST"])
+@authenticated
+def mark_notifications_read(user_id):
+    """
+    Mark a user's notifications read in one statement: the ids listed in
+    {"ids": [...]}, or every unread one when "ids" is absent or null.
+    """
+    if not acting_as(user_id):
+        return jsonify({"error": "Forbidden"}), 403
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+    ids = data.get("ids")
+    if ids is not None:
+        if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+            return jsonify({"error": "ids must be a list of notification ids"}), 400
+        if len(ids) > app.config["NOTIFICATION_READ_MAX_IDS"]:
+            return jsonify({"error": f"At most {app.config['NOTIFICATION_READ_MAX_IDS']} ids per request"}), 400
+        if not ids:
+            return jsonify({"success": True, "updated": 0})
+    db = get_db()
+    if ids:
+        placeholders = ",".join("?" * len(ids))
+        cur = db.execute(
+            f"UPDATE notifications SET is_read=1 WHERE user_id=? AND is_read=0 AND id IN ({placeholders})",
+            (user_id, *ids),
+        )
+    else:
+        cur = db.execute("UPDATE notifications SET is_read=1 WHERE user_id=? AND is_read=0", (user_id,))
+    db.commit()
+    updated = cur.rowcount
+    maybe_compact_notifications(db)
+    return jsonify({"success": True, "updated": updated})
+
+notifications_compacted = float("-inf")
+
+def compact_notifications(db):
+    """Delete read notifications past the retention window. Returns the number removed."""
+    cur = db.execute(
+        "DELETE FROM notifications WHERE is_read=1 AND created_at < datetime('now', ?)",
+        (f"-{app.config['NOTIFICATION_RETENTION_DAYS']} days",),
+    )
+    db.commit()
+    return cur.rowcount
+
+def maybe_compact_notifications(db):
+    global notifications_compacted
+    now = time.monotonic()
+    if now - notifications_compacted >= app.config["NOTIFICATION_COMPACT_INTERVAL"]:
+        notifications_compacted = now
+        removed = compact_notifications(db)
+        if removed:
+            print(f"Removed {removed} old read notifications")
+
 # -------------------------------------------------------------------------
 # QA Sessions Routes
 # -------------------------------------------------------------------------
 @app.route("/api/sessions", methods=["POST"])
+@authenticated
 def create_session():
     data = request.get_json()
     title = data.get("title")
@@ -633,73 +2071,120 @@ def create_session():
 
     if not all([title, description, meeting_link, guide_id, programmer_id]):
         return jsonify({"error": "Missing fields"}), 400
-
-    db = get_db()
-
-    # Insert new session
-    session_id = str(uuid.uuid4())
-    db.execute("""
-        INSERT INTO qa_sessions (id, title, description, meeting_link, guide_id, programmer_id)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (session_id, title, description, meeting_link, guide_id, programmer_id))
-    
-    # Update the related session request to 'approved'
-    db.execute("UPDATE session_requests SET status='approved' WHERE guide_id=? AND programmer_id=?", (guide_id, programmer_id))
-
-    # Notify programmer
-    message = f"A new 1:1 session has been created for you: {title}"
-    db.execute("INSERT INTO notifications (id, user_id, message) VALUES (?, ?, ?)",
-                (str(uuid.uuid4()), programmer_id, message))
-
-    db.commit()
+    if not acting_as(guide_id):
+        return jsonify({"error": "Forbidden"}), 403
+
+    with unit_of_work() as db:
+        # Insert new session
+        session_id = str(uuid.uuid4())
+        db.execute("""
+            INSERT INTO qa_sessions (id, title, description, meeting_link, guide_id, programmer_id)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (session_id, title, description, meeting_link, guide_id, programmer_id))
+
+        # Update the related session request to 'approved'
+        db.execute("UPDATE session_requests SET status='approved' WHERE guide_id=? AND programmer_id=?", (guide_id, programmer_id))
+
+        # Notify programmer
+        message = f"A new 1:1 session has been created for you: {title}"
+        notify(
+            programmer_id, message, "session_created",
+            sessionId=session_id, title=title, meetingLink=meeting_link, guideId=guide_id,
+        )
     return jsonify({"success": True, "sessionId": session_id})
 
 # GET all Q&A sessions (for programmers)
 @app.route("/api/sessions", methods=["GET"])
 def get_all_sessions():
     db = get_db()
-    rows = db.execute("""
-        SELECT s.id, s.title, s.description, s.meeting_link as meetingLink,
-               s.created_at as createdAt, u.name as guideName
-        FROM qa_sessions s
-        JOIN users u ON s.guide_id = u.id
-        ORDER BY s.created_at DESC
-    """).fetchall()
-    return jsonify({"sessions": [dict(r) for r in rows]})
+    sessions, next_cursor = fetch_page(
+        db,
+        "s.id, s.title, s.description, s.meeting_link as meetingLink, s.created_at as createdAt, u.name as guideName",
+        "qa_sessions s JOIN users u ON s.guide_id = u.id",
+        created_col="s.created_at", id_col="s.id", default_order="s.created_at DESC",
+    )
+    return paged_response("sessions", sessions, next_cursor)
 
 
 @app.route("/api/sessions/guide/<guide_id>", methods=["GET"])
+@authenticated
 def get_sessions_for_guide(guide_id):
+    if not acting_as(guide_id):
+        return jsonify({"error": "Forbidden"}), 403
     db = get_db()
-    rows = db.execute("""
-        SELECT s.id, s.title, s.description, s.meeting_link as meetingLink, s.created_at as createdAt, u.name as programmerName
-        FROM qa_sessions s
-        JOIN users u ON s.programmer_id = u.id
-        WHERE s.guide_id=?
-        ORDER BY s.created_at DESC
-    """, (guide_id,)).fetchall()
-    return jsonify({"sessions": [dict(r) for r in rows]})
+    sessions, next_cursor = fetch_page(
+        db,
+        "s.id, s.title, s.description, s.meeting_link as meetingLink, s.created_at as createdAt, u.name as programmerName",
+        "qa_sessions s JOIN users u ON s.programmer_id = u.id",
+        ["s.guide_id=?"], [guide_id],
+        created_col="s.created_at", id_col="s.id", default_order="s.created_at DESC",
+    )
+    return paged_response("sessions", sessions, next_cursor)
 
 @app.route("/api/sessions/programmer/<programmer_id>", methods=["GET"])
+@authenticated
 def get_sessions_for_programmer(programmer_id):
+    if not acting_as(programmer_id):
+        return jsonify({"error": "Forbidden"}), 403
     db = get_db()
-    rows = db.execute("""
-        SELECT s.id, s.title, s.description, s.meeting_link as meetingLink,
-               s.created_at as createdAt, u.name as guideName
-        FROM qa_sessions s
-        JOIN users u ON s.guide_id=u.id
-        WHERE s.programmer_id=?
-        ORDER BY s.created_at DESC
-    """, (programmer_id,)).fetchall()
-    return jsonify({"sessions": [dict(r) for r in rows]})
+    sessions, next_cursor = fetch_page(
+        db,
+        "s.id, s.title, s.description, s.meeting_link as meetingLink, s.created_at as createdAt, u.name as guideName",
+        "qa_sessions s JOIN users u ON s.guide_id=u.id",
+        ["s.programmer_id=?"], [programmer_id],
+        created_col="s.created_at", id_col="s.id", default_order="s.created_at DESC",
+    )
+    return paged_response("sessions", sessions, next_cursor)
 
 
 # -------------------------------------------------------------------------
 # Main
 # -------------------------------------------------------------------------
+def bootstrap_schema():
+    """
+    Create, migrate and seed the database unless its stored schema version
+    is already current. A file lock makes concurrent callers (several
+    workers booting at once) wait for the first one instead of racing it.
+    Returns True if init_db ran.
+    """
+    with open(f"{DATABASE}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        conn = sqlite3.connect(DATABASE, timeout=30)
+        try:
+            if schema_is_current(conn):
+                return False
+        finally:
+            conn.close()
+        with app.app_context():
+            init_db()
+        # Don't hand connections opened here down to forked workers
+        db_pool.close()
+        return True
+
+def check_secret_key():
+    """Tokens signed with the default key can be forged by anyone who has read this file."""
+    if app.config["SECRET_KEY"] != DEFAULT_SECRET_KEY:
+        return
+    if app.config["AUTH_REQUIRED"]:
+        raise RuntimeError("AUTH_REQUIRED is set but SECRET_KEY is the built-in default; set SECRET_KEY")
+    print("WARNING: SECRET_KEY is the built-in default; auth tokens can be forged. Set SECRET_KEY in production.")
+
+def create_app():
+    """
+    Application factory for WSGI servers, e.g.
+
+        gunicorn --preload -w 4 -k gthread --threads 16 "app:create_app()"
+
+    The threaded worker class is required for /api/stream (see
+    STREAM_MAX_CLIENTS); sync workers answer it with 503.
+
+    With --preload the schema check runs once in the master before workers
+    fork; without it each worker runs it and all but the first skip it.
+    """
+    check_secret_key()
+    bootstrap_schema()
+    return app
+
 if __name__ == "__main__":
-    with app.app_context():
-        init_db()
-        migrate()
-    app.run(debug=True, port=5000)
+    create_app().run(debug=True, port=5000)
 
@@ -0,0 +1,208 @@
+"""
+ASGI serving mode.
+
+Runs the Flask app behind an event loop so slow clients don't pin worker
+threads: request bodies are received asynchronously and only handed to
+Flask once complete, and Flask itself runs in bounded thread pools:
+
+- uploads (multipart bodies): ASGI_UPLOAD_THREADS
+- event streams (/api/stream/): long-lived, ASGI_STREAM_THREADS
+- everything else (JSON routes, SQLite): ASGI_THREADS
+
+Upload threads only read the form and wait: every resume, single-file
+routes included, is parsed on the PARSE_WORKERS process pool, so a burst
+of uploads can't starve the JSON routes of threads or of the GIL (unless
+PARSE_WORKERS=0, which parses inline). Start it with
+
+    uvicorn --factory asgi:create_asgi_app --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.exceptions import HTTPException
+
+from app import create_app
+from uploads import view_body_limit
+
+STREAM_PREFIX = "/api/stream/"
+
+
+class AsgiAdapter:
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        config = flask_app.config
+        self.url_map = flask_app.url_map.bind("")
+        self.spool_bytes = config["UPLOAD_SPOOL_BYTES"]
+        self.executors = {
+            "default": ThreadPoolExecutor(config["ASGI_THREADS"], thread_name_prefix="asgi"),
+            "upload": ThreadPoolExecutor(config["ASGI_UPLOAD_THREADS"], thread_name_prefix="asgi-upload"),
+            "stream": ThreadPoolExecutor(config["ASGI_STREAM_THREADS"], thread_name_prefix="asgi-stream"),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for executor in self.executors.values():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _body_limit(self, scope):
+        """The matched route's body limit (see uploads.body_limit), else MAX_CONTENT_LENGTH."""
+        try:
+            endpoint, _ = self.url_map.match(scope["path"], scope["method"])
+        except HTTPException:
+            return self.flask_app.config["MAX_CONTENT_LENGTH"] or None
+        return view_body_limit(self.flask_app, endpoint)
+
+    async def _read_body(self, receive, max_body):
+        """Receive the whole body into a spool, or return None once it exceeds `max_body`."""
+        body = tempfile.SpooledTemporaryFile(max_size=self.spool_bytes)
+        size = 0
+        more = True
+        while more:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                body.close()
+                raise ConnectionError("client disconnected during upload")
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if max_body and size > max_body:
+                body.close()
+                return None, size
+            body.write(chunk)
+            more = message.get("more_body", False)
+        body.seek(0)
+        return body, size
+
+    async def _http(self, scope, receive, send):
+        try:
+            body, size = await self._read_body(receive, self._body_limit(scope))
+        except ConnectionError:
+            return
+        if body is None:
+            await _send_json(send, 413, b'{"error": "Upload too large"}')
+            return
+
+        environ = _environ(scope, body, size)
+        if scope["path"].startswith(STREAM_PREFIX):
+            executor = self.executors["stream"]
+        elif environ.get("CONTENT_TYPE", "").startswith("multipart/"):
+            executor = self.executors["upload"]
+        else:
+            executor = self.executors["default"]
+
+        loop = asyncio.get_running_loop()
+        disconnected = threading.Event()
+
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        def send_sync(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await loop.run_in_executor(executor, self._run_wsgi, environ, send_sync, disconnected)
+        finally:
+            watcher.cancel()
+            body.close()
+
+    def _run_wsgi(self, environ, send_sync, disconnected):
+        """Run the Flask app and relay its response, all on one executor thread."""
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info and response.get("started"):
+                raise exc_info[1].with_traceback(exc_info[2])
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+            return _no_write
+
+        def start():
+            if not response.get("started"):
+                response["started"] = True
+                send_sync({"type": "http.response.start", "status": response["status"], "headers": response["headers"]})
+
+        iterable = self.flask_app(environ, start_response)
+        try:
+            for chunk in iterable:
+                # Stop producing (and let streaming generators clean up) once the client is gone
+                if disconnected.is_set():
+                    return
+                if chunk:
+                    start()
+                    send_sync({"type": "http.response.body", "body": chunk, "more_body": True})
+            start()
+            send_sync({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            close = getattr(iterable, "close", None)
+            if close:
+                close()
+
+
+def _no_write(data):
+    raise NotImplementedError("write() is not supported; return an iterable instead")
+
+
+async def _send_json(send, status, body):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _environ(scope, body, size):
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client") or ("", 0)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0],
+        "REMOTE_PORT": str(client[1]),
+        "CONTENT_LENGTH": str(size),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1")
+        value = value.decode("latin-1")
+        if name == "content-type":
+            environ["CONTENT_TYPE"] = value
+            continue
+        if name == "content-length":
+            # The body has already been read; CONTENT_LENGTH is its real size
+            continue
+        key = "HTTP_" + name.upper().replace("-", "_")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def create_asgi_app():
+    return AsgiAdapter(create_app())
@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import OrderedDict
+
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+
+class TokenSigner:
+    """
+    Issues and verifies signed, expiring bearer tokens carrying a user's id
+    and role. Verification is an HMAC check, so it never touches the DB.
+    """
+
+    def __init__(self, secret_key, max_age):
+        self.max_age = max_age
+        self._serializer = URLSafeTimedSerializer(secret_key, salt="aegis-auth")
+
+    def issue(self, user_id, role):
+        return self._serializer.dumps({"sub": user_id, "role": role})
+
+    def verify(self, token):
+        """Return {"id", "role"} for a valid token, or None if it is forged or expired."""
+        try:
+            payload = self._serializer.loads(token, max_age=self.max_age)
+        except (SignatureExpired, BadSignature):
+            return None
+        return {"id": payload["sub"], "role": payload["role"]}
+
+
+class IdentityCache:
+    """
+    Small TTL + LRU cache of user id -> {"id", "name", "email", "role"}.
+    Misses are cached too, so lookups of unknown ids don't hit the DB
+    every time either.
+    """
+
+    def __init__(self, ttl=300, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        row = db.execute("SELECT id, name, email, role FROM users WHERE id=?", (user_id,)).fetchone()
+        identity = dict(row) if row else None
+        self.put(user_id, identity)
+        return identity
+
+    def put(self, user_id, identity):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, identity)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
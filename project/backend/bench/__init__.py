@@ -0,0 +1,11 @@
+"""
+Benchmark and load-test suite for the backend.
+
+Run from project/backend:
+
+    python -m bench --output results.json
+    python -m bench --baseline results.json --output new.json
+
+Everything runs against a throwaway working directory with a seeded
+database, so the real aegis.db is never touched.
+"""
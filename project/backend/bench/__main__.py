@@ -0,0 +1,105 @@
+import argparse
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmark and load-test the backend.")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--companies", type=int, default=50)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--notifications", type=int, default=5000)
+    parser.add_argument("--resumes", type=int, default=20, help="size of the synthetic PDF/DOCX corpus")
+    parser.add_argument("--iterations", type=int, default=200, help="calls per micro-benchmark")
+    parser.add_argument("--requests", type=int, default=200, help="requests per load scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", action="append", help="run load scenarios whose name contains this (repeatable)")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", help="directory for the seeded database (default: a temp dir)")
+    parser.add_argument("--output", help="write JSON results here")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="fractional p95/throughput change counted as a regression (default 0.1)")
+    return parser.parse_args(argv)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # app.py uses paths relative to the working directory (aegis.db, the
+    # resume cache), so import it from inside the scratch directory
+    sys.path.insert(0, BACKEND_DIR)
+    invoked_from = os.getcwd()
+    workdir = args.workdir or tempfile.mkdtemp(prefix="aegis-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    if os.path.exists("aegis.db"):
+        sys.exit(f"{workdir} already has an aegis.db; pass an empty --workdir")
+
+    from bench.corpus import build_corpus
+    from bench.load import run_load
+    from bench.micro import run_micro
+    from bench.seed import seed_database
+    from bench.stats import compare, load_results, print_comparison, print_summary, write_results
+
+    import app as app_module
+
+    print(f"Seeding {workdir}/aegis.db")
+    started = time.perf_counter()
+    with app_module.app.app_context():
+        app_module.init_db()
+        db = sqlite3.connect("aegis.db")
+        ids = seed_database(db, args.users, args.companies, args.jobs, args.sessions, args.notifications, args.seed)
+        db.close()
+        app_module.reindex_job_skills()
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+    corpus = build_corpus(args.resumes, args.seed)
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "workdir")},
+        },
+        "micro": {},
+        "load": {},
+    }
+    if not args.skip_micro:
+        results["micro"] = run_micro(app_module, corpus, args.iterations, args.seed)
+        print_summary("Micro-benchmarks", results["micro"])
+    if not args.skip_load:
+        results["load"] = run_load(app_module.app, ids, corpus, args.requests, args.concurrency, args.only, args.seed)
+        print_summary(f"Load (concurrency {args.concurrency})", results["load"])
+
+    if args.output:
+        write_results(os.path.join(invoked_from, args.output), results)
+
+    if args.baseline:
+        rows, regressions = compare(results, load_results(os.path.join(invoked_from, args.baseline)), args.threshold)
+        print_comparison(rows, regressions)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Synthetic resume corpus: minimal but valid PDF and DOCX files built with the
+standard library only, so pdfplumber and docx2txt do their real work.
+"""
+import io
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+from skill_matcher import DEFAULT_SKILLS
+
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Linus", "Barbara", "Ken", "Margaret", "Dennis", "Frances", "Guido"]
+LAST_NAMES = ["Lovelace", "Hopper", "Turing", "Torvalds", "Liskov", "Thompson", "Hamilton", "Ritchie", "Allen", "Rossum"]
+ROLES = ["Software Engineer", "Data Scientist", "Backend Developer", "Frontend Developer", "DevOps Engineer",
+         "Machine Learning Engineer", "Full-Stack Developer", "Platform Engineer"]
+FILLER = ("Designed, built and operated services used by thousands of customers. Worked closely with product "
+          "and design, reviewed code, mentored junior engineers and improved reliability and performance.")
+
+
+def resume_text(rng, skills=12, paragraphs=6):
+    """A plausible plain-text resume mentioning `skills` random skills."""
+    names = rng.sample(sorted(DEFAULT_SKILLS), min(skills, len(DEFAULT_SKILLS)))
+    lines = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.choice(ROLES), "", "Skills"]
+    lines += [", ".join(names[i:i + 4]) for i in range(0, len(names), 4)]
+    lines += ["", "Experience"]
+    for _ in range(paragraphs):
+        lines.append(f"{rng.choice(ROLES)} at {rng.choice(LAST_NAMES)} Labs, {rng.randint(1, 8)} years.")
+        lines.append(f"Used {rng.choice(names)} and {rng.choice(names)} daily. {FILLER}")
+    return "\n".join(lines)
+
+
+def _pdf_string(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text, lines_per_page=45):
+    """Single-font, multi-page PDF with one text line per source line."""
+    lines = [line[:95] for line in text.split("\n")] or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        2: f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in page_ids)}] /Count {len(pages)} >>",
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, page in zip(page_ids, pages):
+        content = "BT /F1 11 Tf 50 760 Td 15 TL " + " ".join(f"({_pdf_string(l)}) Tj T*" for l in page) + " ET"
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Contents {page_id + 1} 0 R /Resources << /Font << /F1 3 0 R >> >> >>")
+        objects[page_id + 1] = f"<< /Length {len(content)} >>\nstream\n{content}\nendstream"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number in range(1, len(objects) + 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{objects[number]}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF".encode()
+    return bytes(out)
+
+
+def make_docx(text):
+    """Bare-bones DOCX containing one paragraph per line."""
+    body = "".join(f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>" for line in text.split("\n"))
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml",
+                   '<?xml version="1.0"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                   '<Default Extension="xml" ContentType="application/xml"/></Types>')
+        z.writestr("word/document.xml",
+                   '<?xml version="1.0"?><w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                   f"<w:body>{body}</w:body></w:document>")
+    return buf.getvalue()
+
+
+def build_corpus(count, seed=0, paragraphs=6):
+    """Return `count` (filename, bytes, text) resumes, alternating PDF and DOCX."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(count):
+        text = resume_text(rng, skills=rng.randint(6, 18), paragraphs=paragraphs)
+        if i % 2:
+            corpus.append((f"resume_{i}.docx", make_docx(text), text))
+        else:
+            corpus.append((f"resume_{i}.pdf", make_pdf(text), text))
+    return corpus
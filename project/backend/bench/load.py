@@ -0,0 +1,173 @@
+"""
+Concurrent load driver. Serves the app on a local port with Werkzeug's
+threaded server and hits each endpoint from a pool of client threads.
+"""
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from bench.stats import summarize
+
+
+def multipart(fields, files):
+    """Encode form fields and (field, filename, bytes) files as multipart/form-data."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, filename, data in files:
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f"Content-Type: application/octet-stream\r\n\r\n".encode() + data + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+
+def scenarios(ids, corpus):
+    """
+    name -> function(rng) returning (method, path, body, headers). The
+    resume endpoints cycle through the corpus, so after the first pass they
+    measure the warm resume cache, as production traffic mostly would.
+    """
+    def get(path_fn):
+        return lambda rng: ("GET", path_fn(rng), None, {})
+
+    def resume_post(path, extra=None):
+        def build(rng):
+            filename, data, text = rng.choice(corpus)
+            fields = {"jobDescription": rng.choice(corpus)[2][:600], **(extra or {})}
+            body, headers = multipart(fields, [("resume", filename, data)])
+            return "POST", path, body, headers
+        return build
+
+    def screen_post(files):
+        def build(rng):
+            picked = rng.sample(corpus, min(files, len(corpus)))
+            fields = {"jobDescription": rng.choice(corpus)[2][:600]}
+            body, headers = multipart(fields, [("resumes", filename, data) for filename, data, _ in picked])
+            return "POST", "/api/resume/screen", body, headers
+        return build
+
+    users = ids["programmers"] + ids["guides"] or ["nobody"]
+    return {
+        "GET /api/companies": get(lambda rng: "/api/companies"),
+        "GET /api/jobs": get(lambda rng: "/api/jobs?limit=50"),
+        "GET /api/jobs/<id>": get(lambda rng: f"/api/jobs/{rng.choice(ids['jobs'] or ['none'])}"),
+        "GET /api/jobs/search": get(lambda rng: f"/api/jobs/search?q={rng.choice(ids['searchTerms'])}"),
+        "GET /api/sessions": get(lambda rng: "/api/sessions?limit=50"),
+        "GET /api/notifications/<user>": get(lambda rng: f"/api/notifications/{rng.choice(users)}"),
+        "GET /api/notifications/<user>/unread-count":
+            get(lambda rng: f"/api/notifications/{rng.choice(users)}/unread-count"),
+        "POST /api/analyze-resume": resume_post("/api/analyze-resume"),
+        "POST /api/resume/job-finding": resume_post("/api/resume/job-finding"),
+        "POST /api/resume/job-finding?mode=tfidf": resume_post("/api/resume/job-finding", {"mode": "tfidf"}),
+        "POST /api/resume/screen (5 files)": screen_post(5),
+    }
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class LocalServer:
+    def __init__(self, app):
+        self.server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietRequestHandler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.thread.join()
+
+
+def send(base_url, method, path, body, headers, timeout=60):
+    req = urllib.request.Request(base_url + path, data=body, headers=headers, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            resp.read()
+            return resp.status < 400
+    except urllib.error.HTTPError as e:
+        e.read()
+        return False
+    except OSError:
+        return False
+
+
+def run_scenario(base_url, build, requests, concurrency, seed=0):
+    rng = random.Random(seed)
+    # Build every request up front so client-side encoding isn't timed
+    prepared = [build(rng) for _ in range(requests)]
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(item):
+        nonlocal errors
+        t0 = time.perf_counter()
+        ok = send(base_url, *item)
+        elapsed = time.perf_counter() - t0
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(worker, prepared))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def run_under_parsing(base_url, build, corpus, requests, concurrency, parsers, seed=0):
+    """
+    Run a scenario while `parsers` client threads keep posting never-seen
+    PDFs to /api/analyze-resume, so every one of them is really parsed.
+    Shows whether resume parsing slows down the JSON routes.
+    """
+    pdfs = [(filename, data, text) for filename, data, text in corpus if filename.endswith(".pdf")]
+    stop = threading.Event()
+
+    def parse_until_stopped(n):
+        rng = random.Random(seed + n)
+        while not stop.is_set():
+            filename, data, text = rng.choice(pdfs)
+            # A unique trailing comment changes the content hash, so the resume cache never hits
+            data += f"\n%{uuid.uuid4().hex}\n".encode()
+            body, headers = multipart({"jobDescription": text[:600]}, [("resume", filename, data)])
+            send(base_url, "POST", "/api/analyze-resume", body, headers)
+
+    threads = [threading.Thread(target=parse_until_stopped, args=(n,), daemon=True) for n in range(parsers)]
+    for thread in threads:
+        thread.start()
+    try:
+        return run_scenario(base_url, build, requests, concurrency, seed)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+def run_load(app, ids, corpus, requests=200, concurrency=8, only=None, seed=0):
+    results = {}
+    with LocalServer(app) as server:
+        for name, build in scenarios(ids, corpus).items():
+            if only and not any(pattern in name for pattern in only):
+                continue
+            # One untimed request warms caches and lazily built indexes
+            send(server.base_url, *build(random.Random(seed)))
+            results[name] = run_scenario(server.base_url, build, requests, concurrency, seed)
+
+        name = "GET /api/jobs (during POST /api/analyze-resume)"
+        if not only or any(pattern in name for pattern in only):
+            build = lambda rng: ("GET", "/api/jobs?limit=50", None, {})
+            results[name] = run_under_parsing(server.base_url, build, corpus, requests, concurrency, concurrency, seed)
+    return results
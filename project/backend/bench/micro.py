@@ -0,0 +1,55 @@
+"""Micro-benchmarks for the resume analysis hot paths in app.py."""
+import itertools
+import random
+import time
+
+from bench.stats import summarize
+
+
+def time_calls(func, args, iterations, warmup=3):
+    """Call func(*args[i % len(args)]) `iterations` times and summarize per-call latency."""
+    cycle = itertools.cycle(args)
+    for _ in range(warmup):
+        func(*next(cycle))
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_args = next(cycle)
+        t0 = time.perf_counter()
+        try:
+            func(*call_args)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def run_micro(app_module, corpus, iterations=200, seed=0):
+    """
+    Benchmark the uncached parsing and matching functions directly, without
+    HTTP or the resume cache in the way.
+    """
+    rng = random.Random(seed)
+    texts = [text for _, _, text in corpus]
+    pdfs = [(data, "pdf") for name, data, _ in corpus if name.endswith(".pdf")]
+    docxs = [(data, "docx") for name, data, _ in corpus if name.endswith(".docx")]
+    job_descs = [rng.choice(texts)[:600] for _ in range(len(texts))]
+    parse_iterations = max(iterations // 4, 1)
+
+    results = {}
+    with app_module.app.app_context():
+        # The skill matcher re-checks the taxonomy in the DB, so this needs the context too
+        skill_sets = [app_module.extract_skills_from_text(text) for text in texts]
+        skill_pairs = [(skill_sets[i], skill_sets[(i + 1) % len(skill_sets)]) for i in range(len(skill_sets))]
+        if pdfs:
+            results["parse_resume.pdf"] = time_calls(app_module.parse_resume, pdfs, parse_iterations)
+        if docxs:
+            results["parse_resume.docx"] = time_calls(app_module.parse_resume, docxs, parse_iterations)
+        results["extract_skills_from_text"] = time_calls(
+            app_module.extract_skills_from_text, [(t,) for t in texts], iterations)
+        results["analyze_resume_logic"] = time_calls(
+            app_module.analyze_resume_logic, list(zip(texts, job_descs)), iterations)
+        results["calculate_match_score"] = time_calls(
+            app_module.calculate_match_score, skill_pairs, iterations * 50)
+    return results
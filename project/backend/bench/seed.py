@@ -0,0 +1,77 @@
+"""
+Seed a database with synthetic users, companies, jobs, sessions and
+notifications. The schema must already exist (app.init_db()).
+"""
+import random
+import uuid
+
+from werkzeug.security import generate_password_hash
+
+from bench.corpus import FILLER, ROLES
+from skill_matcher import DEFAULT_SKILLS
+
+LOCATIONS = ["Remote", "San Francisco", "Austin", "New York", "Berlin", "London", "Bangalore", "Toronto"]
+INDUSTRIES = ["Tech", "Analytics", "Finance", "Health", "Retail", "Media"]
+SENIORITY = ["Junior", "Mid-level", "Senior", "Staff", "Lead", "Principal"]
+
+
+def seed_database(db, users=200, companies=50, jobs=2000, sessions=500, notifications=5000, seed=0):
+    """
+    Bulk-insert synthetic rows with executemany and commit. Returns the ids
+    the load driver needs to build realistic requests.
+    """
+    rng = random.Random(seed)
+    skills = sorted(DEFAULT_SKILLS)
+    # One hash for everyone: pbkdf2 per user would dominate seeding time
+    password_hash = generate_password_hash("bench-password")
+
+    user_rows = []
+    for i in range(users):
+        role = ("programmer", "guide", "recruiter")[i % 3]
+        user_rows.append((str(uuid.uuid4()), f"Bench User {i}", f"bench{i}@example.com", password_hash, role))
+    db.executemany("INSERT INTO users (id, name, email, password_hash, role) VALUES (?,?,?,?,?)", user_rows)
+    programmers = [u[0] for u in user_rows if u[4] == "programmer"]
+    guides = [u[0] for u in user_rows if u[4] == "guide"]
+    recruiters = [u[0] for u in user_rows if u[4] == "recruiter"]
+
+    company_rows = [
+        (str(uuid.uuid4()), f"Bench Company {i}", f"{rng.choice(INDUSTRIES)} company", rng.choice(LOCATIONS),
+         rng.choice(INDUSTRIES), rng.choice(["1-50", "50-100", "100-500", "500-1000", "1000+"]))
+        for i in range(companies)
+    ]
+    db.executemany("INSERT INTO companies (id, name, description, location, industry, employees) VALUES (?,?,?,?,?,?)",
+                   company_rows)
+
+    job_rows = []
+    for i in range(jobs if company_rows else 0):
+        required = rng.sample(skills, rng.randint(3, 8))
+        title = f"{rng.choice(SENIORITY)} {rng.choice(ROLES)} {i}"
+        description = f"We are hiring a {title}. You will work with {', '.join(required[:3])}. {FILLER}"
+        job_rows.append((str(uuid.uuid4()), title, description, ", ".join(required), rng.choice(LOCATIONS),
+                         rng.choice(company_rows)[0], rng.choice(recruiters) if recruiters else None))
+    db.executemany("INSERT INTO jobs (id, title, description, requirements, location, company_id, recruiter_id) "
+                   "VALUES (?,?,?,?,?,?,?)", job_rows)
+
+    session_rows = []
+    if guides and programmers:
+        for i in range(sessions):
+            session_rows.append((str(uuid.uuid4()), f"Bench session {i}", "Career guidance",
+                                 f"https://meet.example.com/{i}", rng.choice(guides), rng.choice(programmers)))
+    db.executemany("INSERT INTO qa_sessions (id, title, description, meeting_link, guide_id, programmer_id) "
+                   "VALUES (?,?,?,?,?,?)", session_rows)
+
+    notification_rows = []
+    if user_rows:
+        for i in range(notifications):
+            notification_rows.append((str(uuid.uuid4()), rng.choice(user_rows)[0], f"Bench notification {i}",
+                                      int(rng.random() < 0.7)))
+    db.executemany("INSERT INTO notifications (id, user_id, message, is_read) VALUES (?,?,?,?)", notification_rows)
+    db.commit()
+
+    return {
+        "programmers": programmers,
+        "guides": guides,
+        "jobs": [j[0] for j in job_rows],
+        "companies": [c[0] for c in company_rows],
+        "searchTerms": [s.split()[0].lower() for s in skills if s[0].isalpha()],
+    }
@@ -0,0 +1,82 @@
+import json
+import math
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, elapsed, errors=0):
+    """Latency percentiles (ms) and throughput for one benchmark."""
+    values = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 6)
+    return {
+        "count": len(values),
+        "errors": errors,
+        "p50Ms": ms(percentile(values, 50)),
+        "p95Ms": ms(percentile(values, 95)),
+        "p99Ms": ms(percentile(values, 99)),
+        "meanMs": ms(sum(values) / len(values)) if values else 0.0,
+        "maxMs": ms(values[-1]) if values else 0.0,
+        "throughput": round(len(values) / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Compare p95 latency and throughput of every benchmark present in both
+    result sets. Returns (rows, regressions) where a regression is a p95
+    more than `threshold` slower or throughput more than `threshold` lower.
+    """
+    rows, regressions = [], []
+    for section in ("micro", "load"):
+        for name, current in results.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if not previous:
+                continue
+            p95_change = _change(previous["p95Ms"], current["p95Ms"])
+            throughput_change = _change(previous["throughput"], current["throughput"])
+            row = {
+                "benchmark": f"{section}.{name}",
+                "p95Ms": (previous["p95Ms"], current["p95Ms"], p95_change),
+                "throughput": (previous["throughput"], current["throughput"], throughput_change),
+            }
+            rows.append(row)
+            if p95_change > threshold or throughput_change < -threshold:
+                regressions.append(row["benchmark"])
+    return rows, regressions
+
+
+def _change(before, after):
+    if not before:
+        return 0.0
+    return (after - before) / before
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_results(path, results):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def print_summary(section, results):
+    print(f"\n{section}")
+    print(f"  {'benchmark':<46}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>11}{'errors':>8}")
+    for name, r in results.items():
+        print(f"  {name:<46}{r['count']:>8}{r['p50Ms']:>10.2f}{r['p95Ms']:>10.2f}{r['p99Ms']:>10.2f}"
+              f"{r['throughput']:>11.1f}{r['errors']:>8}")
+
+
+def print_comparison(rows, regressions):
+    print("\nCompared with baseline (p95 / throughput change)")
+    for row in rows:
+        flag = "  REGRESSION" if row["benchmark"] in regressions else ""
+        print(f"  {row['benchmark']:<52}{row['p95Ms'][2]:>+9.1%}{row['throughput'][2]:>+9.1%}{flag}")
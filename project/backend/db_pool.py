@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import threading
+
+
+class ConnectionPool:
+    """
+    Per-process pool of tuned SQLite connections.
+
+    Connections are opened in WAL mode with `synchronous=NORMAL`, a busy
+    timeout and larger page cache / mmap settings, and are reused across
+    requests so sqlite3's per-connection prepared statement cache stays warm.
+    A pool inherited through fork() is discarded and rebuilt in the child.
+    """
+
+    def __init__(self, database, max_size=8, timeout=10.0, busy_timeout_ms=5000,
+                 mmap_size=256 * 1024 * 1024, cache_size_kb=64 * 1024, cached_statements=256):
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.cached_statements = cached_statements
+        self._cond = threading.Condition()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = []
+        self._size = 0
+        self._in_use = 0
+        self.acquired = 0
+        self.waits = 0
+        self.peak_in_use = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.database,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        # Negative cache_size is in KiB rather than pages
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def acquire(self):
+        with self._cond:
+            if self._pid != os.getpid():
+                self._reset()
+            if not self._idle and self._size >= self.max_size:
+                self.waits += 1
+                if not self._cond.wait_for(lambda: self._idle or self._size < self.max_size, self.timeout):
+                    raise RuntimeError("Timed out waiting for a database connection")
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                conn = None
+                self._size += 1
+            self._in_use += 1
+            self.acquired += 1
+            self.peak_in_use = max(self.peak_in_use, self._in_use)
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+        return conn
+
+    def release(self, conn):
+        keep = True
+        try:
+            # Never hand out a connection with a half-finished transaction
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            keep = False
+            conn.close()
+
+        with self._cond:
+            if self._pid != os.getpid():
+                return
+            self._in_use -= 1
+            if keep:
+                self._idle.append(conn)
+            else:
+                self._size -= 1
+            self._cond.notify()
+
+    def close(self):
+        """Close the idle connections, e.g. before forking worker processes."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for conn in idle:
+            conn.close()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self._size,
+                "maxSize": self.max_size,
+                "inUse": self._in_use,
+                "idle": len(self._idle),
+                "peakInUse": self.peak_in_use,
+                "acquired": self.acquired,
+                "waits": self.waits,
+                "utilization": round(self._in_use / self.max_size * 100, 1) if self.max_size else 0,
+            }
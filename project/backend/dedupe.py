@@ -0,0 +1,79 @@
+"""
+Near-duplicate detection for resume texts.
+
+Each text is reduced to word shingles and a MinHash signature; signatures
+are bucketed by LSH bands so a new text is only compared with the few
+earlier texts sharing a band, not with the whole batch.
+"""
+import re
+import zlib
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+# Parameters of the universal hashes (a * x + b) % p standing in for permutations
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def shingles(text, size=5):
+    """Hashes of the distinct `size`-word shingles of a text."""
+    tokens = TOKEN_RE.findall((text or "").lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    if len(tokens) < size:
+        grams = {" ".join(tokens)}
+    else:
+        grams = {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index. `add(key, text)` returns (key, similarity)
+    of an earlier text estimated at least `threshold` similar (Jaccard on
+    shingles), or None after registering the text as a new original.
+    Empty texts are never matched.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=32, shingle_size=5, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, (1 << 32) - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, (1 << 32) - 1, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+
+    def signature(self, text):
+        hashes = shingles(text, self.shingle_size)
+        if not hashes.size:
+            return None
+        with np.errstate(over="ignore"):
+            permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+    def add(self, key, text):
+        signature = self.signature(text)
+        if signature is None:
+            return None
+
+        bands = [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+        candidates = {other for bucket, band in zip(self._buckets, bands) for other in bucket.get(band, ())}
+        best = None
+        for other in candidates:
+            similarity = float(np.mean(self._signatures[other] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (other, similarity)
+        if best:
+            return best
+
+        self._signatures[key] = signature
+        for bucket, band in zip(self._buckets, bands):
+            bucket.setdefault(band, []).append(key)
+        return None
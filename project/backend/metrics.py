@@ -0,0 +1,176 @@
+"""
+Minimal in-process metrics with Prometheus text exposition.
+
+Counters and histograms keep their samples in plain dicts keyed by label
+values behind one lock per metric, so recording costs about a microsecond.
+Values are per process; under gunicorn each worker reports its own.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, _labels(self.labelnames, key), value) for key, value in values]
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                state = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, *labelvalues):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+
+    def samples(self):
+        with self._lock:
+            values = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        samples = []
+        for key, counts, total, count in values:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                samples.append((f"{self.name}_bucket", _labels(self.labelnames, key, f'le="{_number(bound)}"'), cumulative))
+            samples.append((f"{self.name}_sum", _labels(self.labelnames, key), total))
+            samples.append((f"{self.name}_count", _labels(self.labelnames, key), count))
+        return samples
+
+
+class Gauge:
+    """A value read from `func` at scrape time."""
+
+    type = "gauge"
+
+    def __init__(self, name, help, func):
+        self.name = name
+        self.help = help
+        self.func = func
+
+    def samples(self):
+        return [(self.name, "", self.func())]
+
+
+class CounterFunc(Gauge):
+    """A running total kept elsewhere (e.g. a cache's hit count), read from `func` at scrape time."""
+
+    type = "counter"
+
+
+class TimedConnection:
+    """
+    Database connection wrapper that counts statements and the time spent
+    in execute()/executemany(). Rows fetched afterwards are not timed.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.queries = 0
+        self.seconds = 0.0
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return self.conn.execute(sql, parameters)
+        finally:
+            self.queries += 1
+            self.seconds += time.perf_counter() - started
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return self.conn.executemany(sql, seq_of_parameters)
+        finally:
+            self.queries += 1
+            self.seconds += time.perf_counter() - started
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name, help, func):
+        return self.register(Gauge(name, help, func))
+
+    def counter_func(self, name, help, func):
+        return self.register(CounterFunc(name, help, func))
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_number(value)}")
+        return "\n".join(lines) + "\n"
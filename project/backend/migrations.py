@@ -0,0 +1,448 @@
+"""
+Versioned schema migrations.
+
+Each migration runs once, inside its own IMMEDIATE transaction, and is
+recorded in the `schema_version` table. Steps are written to be idempotent
+so databases that were patched by hand before this runner existed still
+upgrade cleanly. Append new migrations to MIGRATIONS; never renumber.
+"""
+import sqlite3
+
+
+def _columns(conn, table):
+    return [c[1] for c in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def session_request_columns(conn):
+    # Previously done by the ad-hoc migrate() at startup
+    cols = _columns(conn, "session_requests")
+    if "programmer_id" not in cols:
+        conn.execute("ALTER TABLE session_requests ADD COLUMN programmer_id TEXT")
+    if "status" not in cols:
+        conn.execute("ALTER TABLE session_requests ADD COLUMN status TEXT DEFAULT 'pending'")
+
+
+def hot_path_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_user_created ON notifications(user_id, created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_session_requests_guide_status ON session_requests(guide_id, status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_qa_sessions_guide_created ON qa_sessions(guide_id, created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_qa_sessions_programmer_created ON qa_sessions(programmer_id, created_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_companies_name ON companies(name)")
+
+    # add_or_update_job treats (company_id, title) as the job's identity. Keep
+    # the newest row of any duplicates left by concurrent writes so the
+    # unique index can be built; the older rows are copied to
+    # jobs_removed_duplicates first so nothing is lost.
+    duplicates = conn.execute("""
+        SELECT id FROM jobs
+        WHERE rowid NOT IN (SELECT MAX(rowid) FROM jobs GROUP BY company_id, title)
+    """).fetchall()
+    if duplicates:
+        ids = [(row[0],) for row in duplicates]
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs_removed_duplicates AS
+            SELECT *, CURRENT_TIMESTAMP AS removed_at FROM jobs WHERE 0
+        """)
+        conn.executemany(
+            "INSERT INTO jobs_removed_duplicates SELECT *, CURRENT_TIMESTAMP FROM jobs WHERE id=?", ids
+        )
+        print(f"Moved {len(ids)} duplicate job rows to jobs_removed_duplicates: "
+              f"{', '.join(job_id for job_id, in ids)}")
+        if _columns(conn, "job_skills"):
+            # Created by migration 12 on databases that predate it
+            conn.executemany("DELETE FROM job_skills WHERE job_id=?", ids)
+        conn.executemany("DELETE FROM jobs WHERE id=?", ids)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_company_title ON jobs(company_id, title)")
+
+
+def jobs_full_text_index(conn):
+    # FTS rows share the job's rowid so triggers and joins never scan the index
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, description, requirements, company_name,
+            tokenize = 'porter unicode61'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, title, description, requirements, company_name)
+            VALUES (NEW.rowid, NEW.title, NEW.description, NEW.requirements,
+                    (SELECT name FROM companies WHERE id = NEW.company_id));
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE ON jobs BEGIN
+            DELETE FROM jobs_fts WHERE rowid = OLD.rowid;
+            INSERT INTO jobs_fts (rowid, title, description, requirements, company_name)
+            VALUES (NEW.rowid, NEW.title, NEW.description, NEW.requirements,
+                    (SELECT name FROM companies WHERE id = NEW.company_id));
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM jobs_fts WHERE rowid = OLD.rowid;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS companies_fts_rename AFTER UPDATE OF name ON companies BEGIN
+            UPDATE jobs_fts SET company_name = NEW.name
+            WHERE rowid IN (SELECT rowid FROM jobs WHERE company_id = NEW.id);
+        END
+    """)
+    conn.execute("DELETE FROM jobs_fts")
+    conn.execute("""
+        INSERT INTO jobs_fts (rowid, title, description, requirements, company_name)
+        SELECT j.rowid, j.title, j.description, j.requirements, c.name
+        FROM jobs j LEFT JOIN companies c ON c.id = j.company_id
+    """)
+
+
+def job_change_log(conn):
+    # Append-only log of touched job ids. In-memory indexes (the TF-IDF
+    # ranker) replay it to catch up with writes from other workers; only
+    # the most recent 10k entries are kept.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS job_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT NOT NULL
+        )
+    """)
+    for op, ref in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS jobs_{op.lower()}_changelog AFTER {op} ON jobs BEGIN
+                INSERT INTO job_changes (job_id) VALUES ({ref}.id);
+                DELETE FROM job_changes WHERE seq <= (SELECT MAX(seq) FROM job_changes) - 10000;
+            END
+        """)
+
+
+def notification_partial_indexes(conn):
+    # Unread badge counts only walk unread rows; retention only walks read ones
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_unread ON notifications(user_id) WHERE is_read = 0")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_read_created ON notifications(created_at) WHERE is_read = 1")
+
+
+def session_request_programmer_details(conn):
+    # request_session stores the programmer's name/email on the request, but
+    # the columns were never part of the schema
+    cols = _columns(conn, "session_requests")
+    if "programmer_name" not in cols:
+        conn.execute("ALTER TABLE session_requests ADD COLUMN programmer_name TEXT")
+    if "programmer_email" not in cols:
+        conn.execute("ALTER TABLE session_requests ADD COLUMN programmer_email TEXT")
+
+
+def notification_event_columns(conn):
+    # Notifications double as the SSE event log: rowid is the event id a
+    # client resumes from, kind/payload carry the structured event.
+    cols = _columns(conn, "notifications")
+    if "kind" not in cols:
+        conn.execute("ALTER TABLE notifications ADD COLUMN kind TEXT")
+    if "payload" not in cols:
+        conn.execute("ALTER TABLE notifications ADD COLUMN payload TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications(user_id)")
+
+
+def candidate_pools(conn):
+    # Screened candidates kept with their extracted skills so a pool can be
+    # re-scored against another job without re-uploading or re-parsing
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS candidate_pools (
+            id TEXT PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pool_candidates (
+            pool_id TEXT NOT NULL,
+            resume_key TEXT NOT NULL,
+            file_name TEXT NOT NULL,
+            skills TEXT NOT NULL,
+            taxonomy_version INTEGER NOT NULL,
+            partial INTEGER DEFAULT 0,
+            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (pool_id, resume_key),
+            FOREIGN KEY (pool_id) REFERENCES candidate_pools(id)
+        )
+    """)
+
+
+def drop_redundant_notification_index(conn):
+    # Migration 7 creates idx_notifications_user; the (user_id, created_at,
+    # ...) index already serves user_id lookups
+    conn.execute("DROP INDEX IF EXISTS idx_notifications_user")
+
+
+def keyset_page_indexes(conn):
+    # fetch_page orders by (created_at, id) DESC and seeks with a row-value
+    # comparison; with id in the index each page is a short index walk
+    # instead of a full scan plus a temp B-tree sort
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_id ON jobs(created_at, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_companies_created_id ON companies(created_at, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_qa_sessions_created_id ON qa_sessions(created_at, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_user_created_id ON notifications(user_id, created_at, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_qa_sessions_guide_created_id ON qa_sessions(guide_id, created_at, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_qa_sessions_programmer_created_id ON qa_sessions(programmer_id, created_at, id)")
+    # Supersede migration 2's (user_id, created_at), (guide_id, created_at)
+    # and (programmer_id, created_at) indexes with the wider ones above
+    conn.execute("DROP INDEX IF EXISTS idx_notifications_user_created")
+    conn.execute("DROP INDEX IF EXISTS idx_qa_sessions_guide_created")
+    conn.execute("DROP INDEX IF EXISTS idx_qa_sessions_programmer_created")
+
+
+def catalog_version(conn):
+    # Catalog generation: bumped by any write to jobs or companies so cached
+    # catalog responses and their ETags are invalidated in every worker.
+    # Databases created before this migration got it from init_db.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)")
+    for table in ("jobs", "companies"):
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_{op.lower()}_catalog AFTER {op} ON {table}
+                BEGIN UPDATE catalog_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP; END
+            """)
+
+
+def job_skills_index(conn):
+    # Skills extracted from each job, keyed skill-first so it doubles as the
+    # inverted skill -> job index used by job finding. Databases created
+    # before this migration got it from init_db.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS job_skills (
+            skill TEXT NOT NULL,
+            job_id TEXT NOT NULL,
+            PRIMARY KEY (skill, job_id),
+            FOREIGN KEY (job_id) REFERENCES jobs(id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_job_skills_job ON job_skills(job_id)")
+
+
+def skill_taxonomy(conn):
+    # Skill taxonomy. Any write to skills/skill_aliases bumps the version so
+    # every worker knows to rebuild its compiled matcher. Databases created
+    # before this migration got it from init_db.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS skills (
+            name TEXT PRIMARY KEY,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS skill_aliases (
+            alias TEXT PRIMARY KEY COLLATE NOCASE,
+            skill TEXT NOT NULL,
+            FOREIGN KEY (skill) REFERENCES skills(name)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS skill_taxonomy_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    conn.execute("INSERT OR IGNORE INTO skill_taxonomy_version (id, version) VALUES (1, 0)")
+    for table in ("skills", "skill_aliases"):
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_{op.lower()}_version AFTER {op} ON {table}
+                BEGIN UPDATE skill_taxonomy_version SET version = version + 1; END
+            """)
+
+
+def screening_queue(conn):
+    # Background screening queue: one row per submitted batch, one per file.
+    # Databases created before this migration got it from init_db.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS screening_jobs (
+            id TEXT PRIMARY KEY,
+            job_description TEXT NOT NULL,
+            status TEXT DEFAULT 'queued' CHECK(status IN ('queued','running','done','cancelled')),
+            total INTEGER NOT NULL,
+            processed INTEGER DEFAULT 0,
+            failed INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS screening_items (
+            id TEXT PRIMARY KEY,
+            job_id TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            filename TEXT NOT NULL,
+            data BLOB,
+            status TEXT DEFAULT 'pending' CHECK(status IN ('pending','done','failed','cancelled')),
+            score INTEGER,
+            result TEXT,
+            FOREIGN KEY (job_id) REFERENCES screening_jobs(id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_screening_items_job ON screening_items(job_id, status, position)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_screening_jobs_status ON screening_jobs(status, created_at)")
+
+
+def notification_event_sequence(conn):
+    # The SSE event id was the implicit rowid, which VACUUM may renumber on a
+    # table with a TEXT primary key. Rebuild with an explicit AUTOINCREMENT
+    # seq, seeded from the current rowids so event ids clients already hold
+    # keep pointing at the same rows.
+    if "seq" in _columns(conn, "notifications"):
+        return
+    conn.execute("""
+        CREATE TABLE notifications_new (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT UNIQUE NOT NULL,
+            user_id TEXT NOT NULL,
+            message TEXT NOT NULL,
+            is_read INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            kind TEXT,
+            payload TEXT,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    """)
+    conn.execute("""
+        INSERT INTO notifications_new (seq, id, user_id, message, is_read, created_at, kind, payload)
+        SELECT rowid, id, user_id, message, is_read, created_at, kind, payload FROM notifications ORDER BY rowid
+    """)
+    conn.execute("DROP TABLE notifications")
+    conn.execute("ALTER TABLE notifications_new RENAME TO notifications")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_unread ON notifications(user_id) WHERE is_read = 0")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_read_created ON notifications(created_at) WHERE is_read = 1")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_user_created_id ON notifications(user_id, created_at, id)")
+    # Stream replay: WHERE user_id=? AND seq > ? ORDER BY seq
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_notifications_user_seq ON notifications(user_id, seq)")
+
+
+def jobs_fts_stable_ids(conn):
+    # jobs has a TEXT primary key, so VACUUM may renumber the rowids that
+    # migration 3 keyed jobs_fts on. Key it on jobs_fts_ids.seq instead, an
+    # explicit INTEGER PRIMARY KEY that VACUUM preserves.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs_fts_ids (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT UNIQUE NOT NULL
+        )
+    """)
+    for trigger in ("jobs_fts_insert", "jobs_fts_update", "jobs_fts_delete", "companies_fts_rename"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("""
+        CREATE TRIGGER jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT OR IGNORE INTO jobs_fts_ids (job_id) VALUES (NEW.id);
+            INSERT INTO jobs_fts (rowid, title, description, requirements, company_name)
+            VALUES ((SELECT seq FROM jobs_fts_ids WHERE job_id = NEW.id),
+                    NEW.title, NEW.description, NEW.requirements,
+                    (SELECT name FROM companies WHERE id = NEW.company_id));
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER jobs_fts_update AFTER UPDATE ON jobs BEGIN
+            DELETE FROM jobs_fts WHERE rowid = (SELECT seq FROM jobs_fts_ids WHERE job_id = OLD.id);
+            DELETE FROM jobs_fts_ids WHERE job_id = OLD.id AND OLD.id <> NEW.id;
+            INSERT OR IGNORE INTO jobs_fts_ids (job_id) VALUES (NEW.id);
+            INSERT INTO jobs_fts (rowid, title, description, requirements, company_name)
+            VALUES ((SELECT seq FROM jobs_fts_ids WHERE job_id = NEW.id),
+                    NEW.title, NEW.description, NEW.requirements,
+                    (SELECT name FROM companies WHERE id = NEW.company_id));
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            DELETE FROM jobs_fts WHERE rowid = (SELECT seq FROM jobs_fts_ids WHERE job_id = OLD.id);
+            DELETE FROM jobs_fts_ids WHERE job_id = OLD.id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER companies_fts_rename AFTER UPDATE OF name ON companies BEGIN
+            UPDATE jobs_fts SET company_name = NEW.name
+            WHERE rowid IN (
+                SELECT f.seq FROM jobs j JOIN jobs_fts_ids f ON f.job_id = j.id WHERE j.company_id = NEW.id
+            );
+        END
+    """)
+    conn.execute("DELETE FROM jobs_fts")
+    conn.execute("INSERT OR IGNORE INTO jobs_fts_ids (job_id) SELECT id FROM jobs")
+    conn.execute("""
+        INSERT INTO jobs_fts (rowid, title, description, requirements, company_name)
+        SELECT f.seq, j.title, j.description, j.requirements, c.name
+        FROM jobs j
+        JOIN jobs_fts_ids f ON f.job_id = j.id
+        LEFT JOIN companies c ON c.id = j.company_id
+    """)
+
+
+MIGRATIONS = [
+    (1, "session_requests programmer_id/status columns", session_request_columns),
+    (2, "hot-path indexes and unique jobs(company_id, title)", hot_path_indexes),
+    (3, "jobs_fts full-text index", jobs_full_text_index),
+    (4, "job_changes log", job_change_log),
+    (5, "partial indexes for unread counts and notification retention", notification_partial_indexes),
+    (6, "session_requests programmer_name/programmer_email columns", session_request_programmer_details),
+    (7, "notification kind/payload columns for the event stream", notification_event_columns),
+    (8, "candidate_pools and pool_candidates", candidate_pools),
+    (9, "drop redundant idx_notifications_user", drop_redundant_notification_index),
+    (10, "(created_at, id) indexes for keyset pagination", keyset_page_indexes),
+    (11, "catalog_version table and jobs/companies triggers", catalog_version),
+    (12, "job_skills inverted index", job_skills_index),
+    (13, "skills, skill_aliases and skill_taxonomy_version", skill_taxonomy),
+    (14, "screening_jobs and screening_items", screening_queue),
+    (15, "notifications.seq as a stable event id", notification_event_sequence),
+    (16, "key jobs_fts on jobs_fts_ids.seq instead of jobs.rowid", jobs_fts_stable_ids),
+]
+
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def schema_is_current(conn):
+    """True when every migration has already been applied to this database."""
+    try:
+        return current_version(conn) >= LATEST_VERSION
+    except sqlite3.OperationalError:
+        # No schema_version table: a fresh database
+        return False
+
+
+def run_migrations(conn):
+    """Apply every migration newer than the stored schema version. Returns the new version."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+
+    for version, name, step in MIGRATIONS:
+        if version <= current_version(conn):
+            continue
+        # IMMEDIATE takes the write lock up front, so when several workers
+        # start together only one applies the step and the rest skip it.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= current_version(conn):
+                conn.rollback()
+                continue
+            print(f"Applying migration {version}: {name}")
+            step(conn)
+            conn.execute("INSERT INTO schema_version (version, name) VALUES (?,?)", (version, name))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return current_version(conn)
@@ -0,0 +1,126 @@
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+# Rows per INSERT statement, well under SQLite's bound parameter limit
+_ROWS_PER_STATEMENT = 200
+
+
+class NotificationWriter:
+    """
+    Batches notification inserts off the request path.
+
+    `write` queues a row and returns immediately. A background thread in each
+    worker process collects whatever arrives within `interval` seconds (up to
+    `max_batch` rows) and inserts it in a single transaction, then passes the
+    inserted rows to `on_written`, e.g. to publish them to live streams.
+    Rows still queued at exit are flushed by `close`.
+    """
+
+    def __init__(self, pool, on_written=None, interval=0.05, max_batch=500):
+        self.pool = pool
+        self.on_written = on_written
+        self.interval = interval
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        atexit.register(self.close)
+
+    def start(self):
+        # One writer thread per process; a queue inherited through fork()
+        # belongs to the parent's writer, so the child starts a fresh one
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="notification-writer", daemon=True)
+            self._thread.start()
+
+    def write(self, user_id, message, kind=None, payload=None):
+        self.start()
+        self._queue.put((str(uuid.uuid4()), user_id, message, kind, json.dumps(payload) if payload else None))
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._take(block=True)
+            if batch:
+                self._write_batch(batch)
+
+    def _take(self, block):
+        try:
+            batch = [self._queue.get(timeout=0.5) if block else self._queue.get_nowait()]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic() if block else 0
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch):
+        conn = self.pool.acquire()
+        try:
+            rows = []
+            for start in range(0, len(batch), _ROWS_PER_STATEMENT):
+                chunk = batch[start:start + _ROWS_PER_STATEMENT]
+                rows += conn.execute(
+                    f"""
+                    INSERT INTO notifications (id, user_id, message, kind, payload)
+                    VALUES {",".join(["(?,?,?,?,?)"] * len(chunk))}
+                    RETURNING seq, id, user_id, message, is_read, created_at, kind, payload
+                    """,
+                    [value for row in chunk for value in row],
+                ).fetchall()
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error writing {len(batch)} notifications: {e}")
+            self.failed += len(batch)
+            return
+        finally:
+            self.pool.release(conn)
+
+        self.written += len(rows)
+        self.batches += 1
+        if self.on_written:
+            try:
+                self.on_written(rows)
+            except Exception as e:
+                print(f"Error publishing notifications: {e}")
+
+    def flush(self):
+        """Write everything queued so far from the calling thread."""
+        while True:
+            batch = self._take(block=False)
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def close(self):
+        if self._pid != os.getpid():
+            # Never started here; anything queued was inherited from the parent
+            return
+        self._stopped.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def stats(self):
+        return {"pending": self.pending(), "written": self.written, "batches": self.batches, "failed": self.failed}
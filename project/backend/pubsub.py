@@ -0,0 +1,49 @@
+import queue
+import threading
+from collections import defaultdict
+
+
+class EventBroker:
+    """
+    In-process pub/sub of per-user events for the SSE stream.
+
+    Each subscriber gets a bounded queue. A subscriber that falls behind
+    simply loses live events; the stream re-reads anything it missed from
+    the notifications table, which is also how events published by other
+    worker processes reach it.
+    """
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        q = queue.Queue(self.max_queue)
+        with self._lock:
+            self._subscribers[user_id].add(q)
+        return q
+
+    def unsubscribe(self, user_id, q):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(q)
+                if not subscribers:
+                    del self._subscribers[user_id]
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "users": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values()),
+            }
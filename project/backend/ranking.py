@@ -0,0 +1,205 @@
+import math
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+class TfidfIndex:
+    """
+    In-memory TF-IDF index of job texts for resume-to-job ranking.
+
+    Rows hold sublinear term frequencies (1 + log tf) in a CSR matrix; IDF
+    weights are applied at query time, so adding or replacing a job only
+    appends a row and adjusts document frequencies. Replaced jobs leave a
+    dead row behind until more than `compact_ratio` of the rows are dead.
+    A query is scored against every job with one sparse matrix-vector
+    product and the top-k are picked with argpartition.
+
+    `sync` keeps the index in step with the `job_changes` log written by
+    triggers on `jobs`, so every worker sees writes made by any other.
+    """
+
+    def __init__(self, compact_ratio=0.25):
+        self.compact_ratio = compact_ratio
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        self.vocab = {}
+        # Document frequencies; over-allocated so new terms don't copy it every time
+        self.df = np.zeros(1024)
+        self.matrix = sparse.csr_matrix((0, 0))
+        self.squared = self.matrix
+        self.row_ids = []
+        self.row_of = {}
+        self.alive = []
+        self.alive_mask = np.zeros(0, dtype=bool)
+        self.dead = 0
+        self.seq = None
+        self._pending = []
+        self._dirty = False
+
+    def _vectorize(self, text, grow):
+        cols, vals = [], []
+        for term, n in Counter(tokenize(text)).items():
+            col = self.vocab.get(term)
+            if col is None:
+                if not grow:
+                    continue
+                col = self.vocab[term] = len(self.vocab)
+            cols.append(col)
+            vals.append(1.0 + math.log(n))
+        return np.array(cols, dtype=np.int64), np.array(vals)
+
+    def _row_cols(self, row):
+        if row < self.matrix.shape[0]:
+            return self.matrix.indices[self.matrix.indptr[row]:self.matrix.indptr[row + 1]]
+        return self._pending[row - self.matrix.shape[0]][0]
+
+    def load(self, docs):
+        """Replace the whole index with (job_id, text) pairs in one pass."""
+        with self._lock:
+            self._clear()
+            vocab = self.vocab
+            indptr, indices, data = [0], [], []
+            for job_id, text in docs:
+                if job_id in self.row_of:
+                    continue
+                for term, n in Counter(tokenize(text)).items():
+                    indices.append(vocab.setdefault(term, len(vocab)))
+                    data.append(1.0 + math.log(n))
+                indptr.append(len(indices))
+                self.row_of[job_id] = len(self.row_ids)
+                self.row_ids.append(job_id)
+            self.matrix = sparse.csr_matrix(
+                (np.array(data), np.array(indices, dtype=np.int64), np.array(indptr)),
+                shape=(len(self.row_ids), len(vocab)),
+            )
+            self.df = np.bincount(self.matrix.indices, minlength=max(len(vocab), 1024)).astype(float)
+            self.alive = [True] * len(self.row_ids)
+            self._dirty = True
+
+    def upsert(self, job_id, text):
+        with self._lock:
+            self.remove(job_id)
+            cols, vals = self._vectorize(text, grow=True)
+            if len(self.vocab) > len(self.df):
+                grown = np.zeros(max(len(self.vocab), 2 * len(self.df)))
+                grown[:len(self.df)] = self.df
+                self.df = grown
+            self.df[cols] += 1
+            self.row_of[job_id] = len(self.row_ids)
+            self.row_ids.append(job_id)
+            self.alive.append(True)
+            self._pending.append((cols, vals))
+            self._dirty = True
+
+    def remove(self, job_id):
+        with self._lock:
+            row = self.row_of.pop(job_id, None)
+            if row is None:
+                return
+            self.df[self._row_cols(row)] -= 1
+            self.alive[row] = False
+            self.dead += 1
+            self._dirty = True
+
+    @staticmethod
+    def _widen(matrix, width):
+        # New CSR view with more (empty) columns; never resize in place while
+        # a query may still be reading the old matrix outside the lock
+        return sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], width))
+
+    def _flush(self):
+        width = len(self.vocab)
+        if self._pending:
+            indptr = np.cumsum([0] + [len(cols) for cols, _ in self._pending])
+            indices = np.concatenate([cols for cols, _ in self._pending])
+            data = np.concatenate([vals for _, vals in self._pending])
+            new_rows = sparse.csr_matrix((data, indices, indptr), shape=(len(self._pending), width))
+            self.matrix = sparse.vstack([self._widen(self.matrix, width), new_rows], format="csr")
+            self._pending = []
+        elif self.matrix.shape[1] != width:
+            self.matrix = self._widen(self.matrix, width)
+
+        self.alive_mask = np.array(self.alive, dtype=bool)
+        if self.dead and self.dead > self.compact_ratio * len(self.row_ids):
+            keep = np.flatnonzero(self.alive_mask)
+            self.matrix = self.matrix[keep]
+            self.row_ids = [self.row_ids[i] for i in keep]
+            self.row_of = {job_id: row for row, job_id in enumerate(self.row_ids)}
+            self.alive = [True] * len(self.row_ids)
+            self.alive_mask = np.ones(len(self.row_ids), dtype=bool)
+            self.dead = 0
+        self.squared = self.matrix.multiply(self.matrix).tocsr()
+        self._dirty = False
+
+    def top_k(self, text, k):
+        """Return up to k (job_id, cosine similarity) pairs, best first."""
+        with self._lock:
+            if self._dirty:
+                self._flush()
+            matrix, squared, alive, row_ids = self.matrix, self.squared, self.alive_mask, self.row_ids
+            df = self.df[:len(self.vocab)].copy()
+            q_cols, q_vals = self._vectorize(text, grow=False)
+
+        n_docs = int(alive.sum())
+        if not n_docs or not len(q_cols) or k < 1:
+            return []
+
+        idf = np.log((1 + n_docs) / (1 + df)) + 1
+        query = np.zeros(len(df))
+        query[q_cols] = q_vals * idf[q_cols]
+
+        # cosine(D_i * idf, q) = (D_i . (q * idf)) / (|D_i * idf| |q|)
+        dots = matrix @ (query * idf)
+        norms = np.sqrt(squared @ (idf * idf)) * np.linalg.norm(query)
+        scores = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        scores[~alive] = 0
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(row_ids[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def sync(self, conn):
+        """
+        Apply job changes logged since the last sync. Falls back to a full
+        reload on first use or when the log has been pruned past our position.
+        """
+        with self._lock:
+            max_seq, min_seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0), COALESCE(MIN(seq), 0) FROM job_changes"
+            ).fetchone()
+            if self.seq == max_seq:
+                return
+
+            if self.seq is None or (min_seq and self.seq < min_seq - 1):
+                rows = conn.execute("SELECT id, title, description, requirements FROM jobs").fetchall()
+                self.load((row[0], " ".join(filter(None, row[1:]))) for row in rows)
+            else:
+                changed = [r[0] for r in conn.execute(
+                    "SELECT DISTINCT job_id FROM job_changes WHERE seq > ? AND seq <= ?", (self.seq, max_seq)
+                )]
+                found = set()
+                for start in range(0, len(changed), 500):
+                    chunk = changed[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT id, title, description, requirements FROM jobs WHERE id IN ({placeholders})", chunk
+                    ).fetchall()
+                    for row in rows:
+                        found.add(row[0])
+                        self.upsert(row[0], " ".join(filter(None, row[1:])))
+                for job_id in set(changed) - found:
+                    self.remove(job_id)
+            self.seq = max_seq
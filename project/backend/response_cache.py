@@ -0,0 +1,44 @@
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """
+    Small LRU of rendered response bodies tagged with the data generation
+    they were built from. An entry from an older generation is treated as
+    a miss, so bumping the generation invalidates everything at once.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key, generation):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != generation:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, generation, body):
+        with self._lock:
+            self._entries[key] = (generation, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "notModified": self.not_modified,
+            }
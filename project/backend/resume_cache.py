@@ -0,0 +1,114 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class ResumeCache:
+    """
+    Cache of parsed resumes keyed by the SHA-256 of the uploaded bytes.
+
+    Entries hold the extracted text, the extracted skills and the skill
+    taxonomy version those skills were computed with. Recently used entries
+    live in an in-process LRU capped at `max_bytes` of text; every entry is
+    also written to a small SQLite database so it survives worker restarts.
+    """
+
+    def __init__(self, db_path, max_bytes=64 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lru = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def _db(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resume_cache (
+                    sha256 TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    skills TEXT NOT NULL,
+                    skills_version INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cols = [c[1] for c in conn.execute("PRAGMA table_info(resume_cache)")]
+            if "skills_version" not in cols:
+                conn.execute("ALTER TABLE resume_cache ADD COLUMN skills_version INTEGER DEFAULT 0")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _entry_size(entry):
+        return len(entry["text"]) + sum(len(s) for s in entry["skills"])
+
+    def _remember(self, key, entry):
+        with self._lock:
+            old = self._lru.pop(key, None)
+            if old is not None:
+                self._size -= self._entry_size(old)
+            self._lru[key] = entry
+            self._size += self._entry_size(entry)
+            while self._size > self.max_bytes and len(self._lru) > 1:
+                _, evicted = self._lru.popitem(last=False)
+                self._size -= self._entry_size(evicted)
+
+    def get(self, key):
+        """Return {"text", "skills", "version"} for a cached resume, or None."""
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return entry
+
+        row = self._db().execute(
+            "SELECT text, skills, skills_version FROM resume_cache WHERE sha256=?", (key,)
+        ).fetchone()
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        entry = {"text": row[0], "skills": json.loads(row[1]), "version": row[2]}
+        self._remember(key, entry)
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key, text, skills, version=0):
+        entry = {"text": text, "skills": list(skills), "version": version}
+        self._remember(key, entry)
+        conn = self._db()
+        conn.execute(
+            "INSERT OR REPLACE INTO resume_cache (sha256, text, skills, skills_version) VALUES (?,?,?,?)",
+            (key, text, json.dumps(entry["skills"]), version),
+        )
+        conn.commit()
+        return entry
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memoryHits": self.memory_hits,
+                "diskHits": self.hits - self.memory_hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups * 100, 1) if lookups else 0,
+                "memoryEntries": len(self._lru),
+                "memoryBytes": self._size,
+                "maxBytes": self.max_bytes,
+            }
@@ -0,0 +1,170 @@
+"""
+Resume text extraction, with guards for very long or pathological PDFs.
+
+Two extraction paths are available:
+- full: pdfplumber's layout-aware `extract_text()` (the original behaviour)
+- fast: pdfminer's text converter with default line grouping, roughly
+  three times cheaper (no pdfplumber character objects) and keeping the
+  same line and word breaks the skill matcher relies on
+
+Both stop after `max_pages` pages or once `max_chars` characters have been
+collected, and give up after `budget` seconds, returning whatever text was
+extracted so far with `partial` set. The budget is enforced with SIGALRM,
+which only works on the main thread (parse pool workers, gunicorn sync
+workers); on any other thread the parse runs on a helper thread that the
+caller stops waiting for once the budget is spent. Only the parse pool's
+per-file timeout, which kills the worker process, can reclaim a page that
+never finishes.
+
+pdfplumber, pdfminer and docx2txt are only imported on first use (or by
+`load_parsers()`), so processes that never see a resume don't pay for them.
+"""
+import io
+import signal
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+
+def load_parsers():
+    """
+    Import the parsing libraries now. Call before forking parse workers so
+    they inherit the modules instead of importing them in every child.
+    """
+    import docx2txt  # noqa: F401
+    import pdfplumber  # noqa: F401
+    from pdfminer import converter, layout, pdfinterp, pdfpage  # noqa: F401
+
+
+class ParseBudgetExceeded(BaseException):
+    # BaseException so pdfminer's own `except Exception` blocks can't swallow it
+    pass
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Interrupt the block with ParseBudgetExceeded after `seconds`. Signals
+    are only delivered to the main thread, so anywhere else this does
+    nothing; extract_pdf_text falls back to a helper thread there.
+    """
+    if not seconds or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise ParseBudgetExceeded()
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _layout_pages(source, stack):
+    import pdfplumber
+
+    pdf = stack.enter_context(pdfplumber.open(source))
+
+    def extract(page):
+        text = page.extract_text() or ""
+        # Drop the page's parsed objects; long PDFs otherwise keep them all
+        page.flush_cache()
+        return text
+
+    return pdf.pages, extract
+
+
+def _plain_pages(source, stack):
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    manager = PDFResourceManager(caching=True)
+    # Without LAParams the converter emits text runs back to back with no
+    # line breaks or spaces, gluing words ("EngineerSkillsReact") together
+    buffer = io.StringIO()
+    device = stack.enter_context(TextConverter(manager, buffer, laparams=LAParams()))
+    interpreter = PDFPageInterpreter(manager, device)
+
+    def extract(page):
+        buffer.seek(0)
+        buffer.truncate()
+        interpreter.process_page(page)
+        return buffer.getvalue()
+
+    return PDFPage.get_pages(source), extract
+
+
+def extract_pdf_text(source, fast=False, max_pages=0, max_chars=0, budget=0):
+    """
+    Extract text from a PDF stream page by page. Returns {"text", "pages",
+    "truncated", "partial"}: `truncated` means a page or character cap was
+    reached, `partial` that the time budget ran out or the file broke midway.
+    """
+    if budget and threading.current_thread() is not threading.main_thread():
+        return _extract_on_helper(source, fast, max_pages, max_chars, budget)
+    return _extract(source, fast, max_pages, max_chars, budget, [])
+
+
+def _extract_on_helper(source, fast, max_pages, max_chars, budget):
+    # No SIGALRM off the main thread, and a thread can't be interrupted, so
+    # parse on a helper and stop waiting when the budget is spent. A page
+    # that never finishes keeps the helper busy, but the caller is not.
+    parts = []
+    done = {}
+    stop = threading.Event()
+
+    def run():
+        done["result"] = _extract(source, fast, max_pages, max_chars, budget, parts, stop)
+
+    helper = threading.Thread(target=run, name="pdf-extract", daemon=True)
+    helper.start()
+    helper.join(budget)
+    if "result" in done:
+        return done["result"]
+    stop.set()
+    print(f"PDF parse exceeded its {budget}s budget after {len(parts)} pages; abandoning it")
+    parts = list(parts)
+    text = "\n".join(parts)
+    return {"text": text[:max_chars] if max_chars else text, "pages": len(parts), "truncated": False, "partial": True}
+
+
+def _extract(source, fast, max_pages, max_chars, budget, parts, stop=None):
+    chars = 0
+    result = {"text": "", "pages": 0, "truncated": False, "partial": False}
+    deadline = time.monotonic() + budget if budget else None
+    try:
+        with time_limit(budget), ExitStack() as stack:
+            pages, extract = (_plain_pages if fast else _layout_pages)(source, stack)
+            for page in pages:
+                if (max_pages and result["pages"] >= max_pages) or (max_chars and chars >= max_chars):
+                    result["truncated"] = True
+                    break
+                if (deadline and time.monotonic() >= deadline) or (stop and stop.is_set()):
+                    result["partial"] = True
+                    break
+                text = extract(page)
+                parts.append(text)
+                chars += len(text)
+                result["pages"] += 1
+    except ParseBudgetExceeded:
+        print(f"PDF parse exceeded its {budget}s budget after {result['pages']} pages")
+        result["partial"] = True
+    except Exception as e:
+        print(f"Error parsing PDF after {result['pages']} pages: {e}")
+        result["partial"] = bool(parts)
+
+    text = "\n".join(parts)
+    result["text"] = text[:max_chars] if max_chars else text
+    return result
+
+
+def extract_docx_text(source):
+    import docx2txt
+
+    return docx2txt.process(source) or ""
@@ -0,0 +1,150 @@
+import atexit
+import multiprocessing
+import resource
+import threading
+import time
+
+
+def _rss_mb():
+    """
+    Memory this process holds on its own, in MB. Not ru_maxrss: that is a
+    peak, and a forked worker inherits its parent's. Pages still shared
+    copy-on-write with the parent are left out too, so a large parent
+    doesn't make every worker look oversized.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            kb = sum(int(line.split()[1]) for line in f if line.startswith(("Private_Clean:", "Private_Dirty:")))
+        return kb / 1024
+    except OSError:
+        # No procfs: fall back to the peak (kilobytes on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(func, args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started, _rss_mb()
+
+
+class ParsePool:
+    """
+    Process pool that runs resume parsing off the request thread.
+
+    Each worker is replaced after `max_tasks_per_child` files. The whole pool
+    is recycled when a worker reports an RSS above `max_rss_mb`, or killed and
+    restarted when a single file runs past `timeout` seconds.
+
+    The timeout is counted from when the caller starts waiting for a file,
+    i.e. once every file before it has come back, not from when a worker
+    picked it up. A file that started in parallel with a slow predecessor
+    can therefore run for up to about twice `timeout` before it is killed;
+    the parser's own PARSE_TIME_BUDGET is the tighter per-file limit.
+    With `workers=0` everything runs inline in the calling process.
+    `on_timing(args, seconds)`, if given, is called in the calling process
+    with how long each successful call took inside its worker.
+    """
+
+    def __init__(self, func, workers=2, timeout=30, max_tasks_per_child=50, max_rss_mb=512, on_timing=None):
+        self.func = func
+        self.workers = workers
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.max_rss_mb = max_rss_mb
+        self.on_timing = on_timing
+        self._pool = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _get_pool(self):
+        # Created lazily so each gunicorn worker forks its own children
+        if self._pool is None:
+            ctx = multiprocessing.get_context("fork")
+            self._pool = ctx.Pool(self.workers, maxtasksperchild=self.max_tasks_per_child)
+        return self._pool
+
+    def _detach(self, pool):
+        """Stop handing out `pool`. Returns False if another caller already replaced it."""
+        with self._lock:
+            if pool is None or self._pool is not pool:
+                return False
+            self._pool = None
+            return True
+
+    @staticmethod
+    def _shutdown(pool, terminate=False):
+        if terminate:
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
+
+    def close(self):
+        pool = self._pool
+        if self._detach(pool):
+            self._shutdown(pool, terminate=True)
+
+    def map(self, items, default=""):
+        """
+        Run `func(*args)` for every args tuple in `items` and return the results
+        in the same order. Items that fail or time out come back as `default`.
+        """
+        return list(self.imap(items, default))
+
+    def imap(self, items, default=""):
+        """Like `map`, but yield each result as soon as it (and those before it) is ready."""
+        items = list(items)
+        if self.workers <= 0:
+            for args in items:
+                yield self._run_inline(args, default)
+            return
+
+        # The lock only guards submitting to and replacing the pool, never a
+        # yield: a slow consumer must not stall other callers' parses
+        recycle = None
+        start = 0
+        while start < len(items):
+            with self._lock:
+                pool = self._get_pool()
+                pending = [pool.apply_async(_run, (self.func, args)) for args in items[start:]]
+            for offset, res in enumerate(pending):
+                idx = start + offset
+                try:
+                    result, seconds, rss = res.get(timeout=self.timeout)
+                except multiprocessing.TimeoutError:
+                    if self._detach(pool):
+                        # A stuck worker cannot be reclaimed, so kill the pool
+                        # and resubmit whatever was still queued behind it.
+                        print(f"Resume parse timed out after {self.timeout}s, restarting pool")
+                        self._shutdown(pool, terminate=True)
+                        start = idx + 1
+                        yield default
+                    else:
+                        # Another caller killed the pool under this item; resubmit it
+                        start = idx
+                    break
+                except Exception as e:
+                    print(f"Error parsing resume in pool: {e}")
+                    yield default
+                    continue
+                if self.on_timing:
+                    self.on_timing(items[idx], seconds)
+                if self.max_rss_mb and rss > self.max_rss_mb:
+                    recycle = pool
+                yield result
+            else:
+                start = len(items)
+        if self._detach(recycle):
+            print(f"Parse worker RSS above {self.max_rss_mb} MB, recycling pool")
+            self._shutdown(recycle)
+
+    def _run_inline(self, args, default):
+        started = time.perf_counter()
+        try:
+            result = self.func(*args)
+        except Exception as e:
+            print(f"Error parsing resume: {e}")
+            return default
+        if self.on_timing:
+            self.on_timing(args, time.perf_counter() - started)
+        return result
@@ -0,0 +1,206 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+
+class ScreeningQueue:
+    """
+    SQLite-backed queue for bulk resume screening.
+
+    `submit` stores the batch in screening_jobs/screening_items and returns
+    right away. A background thread in each worker process claims queued jobs,
+    runs their files through `process_batch(job_description, uploads)` a few
+    at a time and stores each candidate as soon as it is scored, so progress
+    and partial results can be read while the job runs. `process_batch`
+    yields (index into uploads, candidate or None) as each file finishes;
+    files it never yields count as failed. Every stored file refreshes the
+    job's `updated_at`, so jobs left `running` by a dead process are picked
+    up again once `stale_after` seconds pass without a file completing.
+    """
+
+    def __init__(self, db_path, process_batch, batch_size=16, poll_interval=2.0, stale_after=300):
+        self.db_path = db_path
+        self.process_batch = process_batch
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def start(self):
+        # One worker thread per process; restarted in children after a fork
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="screening-worker", daemon=True).start()
+
+    def submit(self, job_description, uploads):
+        """Queue a batch of (filename, data) uploads and return the screening job id."""
+        job_id = str(uuid.uuid4())
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO screening_jobs (id, job_description, total) VALUES (?,?,?)",
+                (job_id, job_description, len(uploads)),
+            )
+            conn.executemany(
+                "INSERT INTO screening_items (id, job_id, position, filename, data) VALUES (?,?,?,?,?)",
+                [(str(uuid.uuid4()), job_id, i, filename, data) for i, (filename, data) in enumerate(uploads)],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self.start()
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id, status, total, processed, failed, created_at, updated_at FROM screening_jobs WHERE id=?",
+                (job_id,),
+            ).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def results(self, job_id):
+        """Candidates scored so far, best first."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT result FROM screening_items WHERE job_id=? AND status='done' ORDER BY score DESC, position",
+                (job_id,),
+            ).fetchall()
+            return [json.loads(r["result"]) for r in rows]
+        finally:
+            conn.close()
+
+    def cancel(self, job_id):
+        """Stop a queued or running job. Candidates already scored are kept."""
+        conn = self._connect()
+        try:
+            cur = conn.execute(
+                "UPDATE screening_jobs SET status='cancelled', updated_at=CURRENT_TIMESTAMP "
+                "WHERE id=? AND status IN ('queued','running')",
+                (job_id,),
+            )
+            # Uploads that will never be processed don't need to be kept
+            conn.execute(
+                "UPDATE screening_items SET status='cancelled', data=NULL WHERE job_id=? AND status='pending'",
+                (job_id,),
+            )
+            conn.commit()
+            return cur.rowcount > 0
+        finally:
+            conn.close()
+
+    def _run(self):
+        while True:
+            try:
+                conn = self._connect()
+                try:
+                    job_id = self._claim(conn)
+                    if job_id:
+                        self._process(conn, job_id)
+                        continue
+                finally:
+                    conn.close()
+            except Exception as e:
+                print(f"Error in screening worker: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _claim(self, conn):
+        stale = f"-{int(self.stale_after)} seconds"
+        rows = conn.execute("""
+            SELECT id FROM screening_jobs
+            WHERE status='queued' OR (status='running' AND updated_at < datetime('now', ?))
+            ORDER BY created_at
+            LIMIT 5
+        """, (stale,)).fetchall()
+        for row in rows:
+            cur = conn.execute("""
+                UPDATE screening_jobs SET status='running', updated_at=CURRENT_TIMESTAMP
+                WHERE id=? AND (status='queued' OR (status='running' AND updated_at < datetime('now', ?)))
+            """, (row["id"], stale))
+            conn.commit()
+            if cur.rowcount:
+                return row["id"]
+        return None
+
+    def _process(self, conn, job_id):
+        while True:
+            job = conn.execute(
+                "SELECT job_description, status FROM screening_jobs WHERE id=?", (job_id,)
+            ).fetchone()
+            if job is None or job["status"] != "running":
+                return
+
+            items = conn.execute("""
+                SELECT id, filename, data FROM screening_items
+                WHERE job_id=? AND status='pending'
+                ORDER BY position
+                LIMIT ?
+            """, (job_id, self.batch_size)).fetchall()
+            if not items:
+                conn.execute(
+                    "UPDATE screening_jobs SET status='done', updated_at=CURRENT_TIMESTAMP WHERE id=? AND status='running'",
+                    (job_id,),
+                )
+                conn.commit()
+                return
+
+            stored = set()
+            batch = iter(self.process_batch(job["job_description"], [(i["filename"], i["data"]) for i in items]))
+            try:
+                for index, candidate in batch:
+                    stored.add(index)
+                    if not self._store(conn, job_id, items[index], candidate):
+                        # Cancelled (or reclaimed) while the batch was in flight
+                        break
+            except Exception as e:
+                print(f"Error screening batch for job {job_id}: {e}")
+            finally:
+                if hasattr(batch, "close"):
+                    batch.close()
+            for index, item in enumerate(items):
+                if index not in stored:
+                    self._store(conn, job_id, item, None)
+
+    def _store(self, conn, job_id, item, candidate):
+        """
+        Record one file's outcome. Returns False, writing nothing, when the
+        item is no longer pending, e.g. because the job was cancelled.
+        """
+        # One commit per file keeps updated_at fresh while a slow batch runs
+        if candidate is None:
+            cur = conn.execute(
+                "UPDATE screening_items SET status='failed', data=NULL WHERE id=? AND status='pending'",
+                (item["id"],),
+            )
+        else:
+            cur = conn.execute(
+                "UPDATE screening_items SET status='done', data=NULL, score=?, result=? WHERE id=? AND status='pending'",
+                (candidate["score"], json.dumps(candidate), item["id"]),
+            )
+        if not cur.rowcount:
+            conn.commit()
+            return False
+        conn.execute("""
+            UPDATE screening_jobs
+            SET processed = processed + 1, failed = failed + ?, updated_at=CURRENT_TIMESTAMP
+            WHERE id=?
+        """, (candidate is None, job_id))
+        conn.commit()
+        return True
@@ -0,0 +1,174 @@
+import re
+
+# Seed taxonomy: canonical skill name -> aliases. Loaded into the `skills`
+# and `skill_aliases` tables the first time the database is initialised.
+DEFAULT_SKILLS = {
+    "Python": [],
+    "JavaScript": ["JS", "ECMAScript"],
+    "TypeScript": ["TS"],
+    "React": ["React.js", "ReactJS"],
+    "Node.js": ["NodeJS", "Node js"],
+    "SQL": [],
+    "AWS": ["Amazon Web Services"],
+    "Docker": [],
+    "ML": ["Machine Learning"],
+    "Java": [],
+    "Kotlin": [],
+    "Scala": [],
+    "C++": ["CPP"],
+    "C#": ["CSharp"],
+    "Golang": ["Go lang"],
+    "Rust": [],
+    "Ruby": [],
+    "Ruby on Rails": ["Rails", "RoR"],
+    "PHP": [],
+    "Laravel": [],
+    "Swift": [],
+    "Objective-C": [],
+    "Dart": [],
+    "Flutter": [],
+    "MATLAB": [],
+    "Perl": [],
+    "Bash": ["Shell Scripting"],
+    "PowerShell": [],
+    "HTML": ["HTML5"],
+    "CSS": ["CSS3"],
+    "Sass": ["SCSS"],
+    "Tailwind CSS": ["Tailwind"],
+    "Bootstrap": [],
+    "Angular": ["AngularJS"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Svelte": [],
+    "Next.js": ["NextJS"],
+    "Redux": [],
+    "GraphQL": [],
+    "REST": ["RESTful", "REST API"],
+    "gRPC": [],
+    "Express.js": ["ExpressJS"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring": ["Spring Boot"],
+    ".NET": ["ASP.NET", "dotnet", ".NET Core"],
+    "PostgreSQL": ["Postgres"],
+    "MySQL": [],
+    "SQLite": [],
+    "MongoDB": ["Mongo"],
+    "Redis": [],
+    "Elasticsearch": [],
+    "Cassandra": [],
+    "DynamoDB": [],
+    "Oracle": [],
+    "Kafka": ["Apache Kafka"],
+    "RabbitMQ": [],
+    "Spark": ["Apache Spark", "PySpark"],
+    "Hadoop": [],
+    "Airflow": ["Apache Airflow"],
+    "Snowflake": [],
+    "Databricks": [],
+    "Tableau": [],
+    "Power BI": ["PowerBI"],
+    "Microsoft Excel": ["MS Excel"],
+    "Pandas": [],
+    "NumPy": [],
+    "SciPy": [],
+    "scikit-learn": ["sklearn"],
+    "TensorFlow": [],
+    "PyTorch": [],
+    "Keras": [],
+    "Deep Learning": [],
+    "NLP": ["Natural Language Processing"],
+    "Computer Vision": [],
+    "Data Analysis": [],
+    "Statistics": [],
+    "Azure": ["Microsoft Azure"],
+    "GCP": ["Google Cloud", "Google Cloud Platform"],
+    "Kubernetes": ["K8s"],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "CI/CD": ["Continuous Integration"],
+    "GitHub Actions": [],
+    "Git": [],
+    "Linux": [],
+    "Nginx": [],
+    "Microservices": [],
+    "System Design": [],
+    "Agile": ["Scrum"],
+    "Jira": [],
+    "Figma": [],
+    "Selenium": [],
+    "Cypress": [],
+    "Jest": [],
+    "Pytest": [],
+    "JUnit": [],
+    "Unit Testing": [],
+    "Android": [],
+    "iOS": [],
+    "React Native": [],
+    "Security": ["Cybersecurity"],
+    "OAuth": [],
+}
+
+# Names that are also everyday English words ("a REST API" vs "rest of the
+# team", "go@rails.com"). These only match with the capitalisation given
+# here; everything else in the taxonomy matches case-insensitively.
+CASE_SENSITIVE = {
+    "REST", "RESTful", "Spring", "Spring Boot", "Swift", "Agile", "Security", "Ruby", "Rails",
+    "Rust", "Dart", "Spark", "Oracle", "Jest", "Bootstrap", "Snowflake", "Airflow", "Statistics",
+}
+
+
+def _trie(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return trie
+
+
+def _trie_pattern(node):
+    # Turn a character trie into a regex so shared prefixes are only tried once
+    end = "" in node
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not end:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if end else group
+
+
+class SkillMatcher:
+    """
+    Finds taxonomy skills in text with a single compiled regex.
+
+    Every skill name and alias is folded into one pattern anchored on
+    alphanumeric boundaries, so "ML" does not match inside "HTML" and each
+    document is scanned once. Names in `case_sensitive` must match exactly;
+    the rest are matched case-insensitively.
+    """
+
+    def __init__(self, aliases, version=0, case_sensitive=CASE_SENSITIVE):
+        # aliases: {alias or skill name: canonical skill name}
+        self.version = version
+        self.exact = {alias: skill for alias, skill in aliases.items() if alias in case_sensitive}
+        self.canonical = {alias.lower(): skill for alias, skill in aliases.items() if alias not in case_sensitive}
+        branches = []
+        if self.canonical:
+            branches.append("(?i:" + _trie_pattern(_trie(self.canonical)) + ")")
+        if self.exact:
+            branches.append(_trie_pattern(_trie(self.exact)))
+        body = "|".join(branches) or "(?!)"
+        self.pattern = re.compile(r"(?<![A-Za-z0-9])(" + body + r")(?![A-Za-z0-9])")
+
+    def extract(self, text):
+        """Return the distinct canonical skills in `text`, in order of appearance."""
+        found = {}
+        for match in self.pattern.finditer(text or ""):
+            alias = match.group(1)
+            skill = self.exact.get(alias) or self.canonical[alias.lower()]
+            found.setdefault(skill, None)
+        return list(found)
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture(scope="session")
+def app_module(tmp_path_factory):
+    """
+    The app, imported from a scratch directory: app.py opens aegis.db and
+    the resume cache relative to the working directory at import time.
+    """
+    invoked_from = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("aegis"))
+    os.environ.setdefault("PARSE_WORKERS", "0")
+    import app
+    app.bootstrap_schema()
+    yield app
+    os.chdir(invoked_from)
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
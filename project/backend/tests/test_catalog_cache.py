@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def add_company(app_module):
+    added = []
+
+    def add():
+        company = f"company-{uuid.uuid4().hex}"
+        with app_module.app.app_context():
+            db = app_module.get_db()
+            db.execute("INSERT INTO companies (id, name) VALUES (?,?)", (company, company))
+            db.commit()
+        # Written behind the app's back, so don't wait for CATALOG_CHECK_SECONDS
+        app_module.invalidate_catalog()
+        added.append(company)
+        return company
+
+    yield add
+    with app_module.app.app_context():
+        db = app_module.get_db()
+        db.executemany("DELETE FROM companies WHERE id=?", [(company,) for company in added])
+        db.commit()
+    app_module.invalidate_catalog()
+
+
+def test_validators_are_set(client):
+    response = client.get("/api/companies")
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+    assert response.headers["Cache-Control"] == "no-cache"
+
+
+def test_matching_etag_is_304(client):
+    etag = client.get("/api/companies").headers["ETag"]
+    response = client.get("/api/companies", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_etag_depends_on_query(client):
+    first = client.get("/api/jobs?limit=1").headers["ETag"]
+    second = client.get("/api/jobs?limit=2").headers["ETag"]
+    assert first != second
+    response = client.get("/api/jobs?limit=2", headers={"If-None-Match": first})
+    assert response.status_code == 200
+
+
+def test_write_invalidates_etag(client, add_company):
+    etag = client.get("/api/companies").headers["ETag"]
+    company = add_company()
+    response = client.get("/api/companies", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert company in {c["id"] for c in response.get_json()["companies"]}
+
+
+def test_if_modified_since(client):
+    last_modified = client.get("/api/companies").headers["Last-Modified"]
+    assert client.get("/api/companies", headers={"If-Modified-Since": last_modified}).status_code == 304
+    earlier = "Mon, 01 Jan 2001 00:00:00 GMT"
+    assert client.get("/api/companies", headers={"If-Modified-Since": earlier}).status_code == 200
+
+
+def test_if_none_match_wins_over_if_modified_since(client):
+    last_modified = client.get("/api/companies").headers["Last-Modified"]
+    response = client.get("/api/companies", headers={"If-None-Match": '"stale"', "If-Modified-Since": last_modified})
+    assert response.status_code == 200
+
+
+def test_errors_are_not_cached(client):
+    response = client.get("/api/jobs/no-such-job")
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from dedupe import NearDuplicateIndex, shingles
+
+WORDS = ("python django flask postgres docker kubernetes aws terraform react typescript "
+         "led built shipped migrated designed team service pipeline latency throughput").split()
+
+
+def resume(seed, length=300):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def edit(text, every):
+    """Replace every `every`-th word, which changes roughly 5/every of the 5-word shingles."""
+    words = text.split()
+    return " ".join("changed" if i % every == 0 else w for i, w in enumerate(words))
+
+
+def test_shingles_are_distinct_word_windows():
+    assert len(shingles("a b c d e f", size=5)) == 2
+    assert len(shingles("a b c d e a b c d e", size=5)) == 5
+    # Shorter than one shingle: the whole text is one
+    assert len(shingles("just three words", size=5)) == 1
+    assert len(shingles("", size=5)) == 0
+
+
+def test_identical_text_matches_original():
+    index = NearDuplicateIndex()
+    text = resume(1)
+    assert index.add("a", text) is None
+    assert index.add("b", text) == ("a", 1.0)
+
+
+def test_light_edit_is_a_duplicate():
+    index = NearDuplicateIndex(threshold=0.8)
+    text = resume(1)
+    index.add("a", text)
+    match = index.add("b", edit(text, 100))
+    assert match is not None and match[0] == "a"
+    assert 0.8 <= match[1] < 1.0
+
+
+def test_heavy_edit_is_not_a_duplicate():
+    index = NearDuplicateIndex(threshold=0.8)
+    text = resume(1)
+    index.add("a", text)
+    assert index.add("b", edit(text, 5)) is None
+
+
+def test_unrelated_texts_are_not_duplicates():
+    index = NearDuplicateIndex()
+    assert [index.add(n, resume(n)) for n in range(10)] == [None] * 10
+
+
+@pytest.mark.parametrize("threshold, expected", [(0.5, True), (0.99, False)])
+def test_threshold_decides(threshold, expected):
+    index = NearDuplicateIndex(threshold=threshold)
+    text = resume(1)
+    index.add("a", text)
+    assert (index.add("b", edit(text, 30)) is not None) is expected
+
+
+def test_duplicates_are_not_registered_as_originals():
+    index = NearDuplicateIndex()
+    text = resume(1)
+    index.add("a", text)
+    index.add("b", text)
+    assert index.add("c", text) == ("a", 1.0)
+
+
+def test_empty_text_is_never_matched():
+    index = NearDuplicateIndex()
+    assert index.add("a", "") is None
+    assert index.add("b", "") is None
+    assert index.add("c", None) is None
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=100, bands=32)
@@ -0,0 +1,69 @@
+import uuid
+
+import pytest
+from werkzeug.exceptions import BadRequest
+
+
+def test_cursor_round_trip(app_module):
+    cursor = app_module.encode_cursor("2024-01-02 03:04:05", "job-1")
+    assert "=" not in cursor
+    assert app_module.decode_cursor(cursor) == ("2024-01-02 03:04:05", "job-1")
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", "WyJhIl0"])
+def test_bad_cursor_is_400(app_module, cursor):
+    # "e30" is {} and "WyJhIl0" is ["a"]: valid base64 JSON, wrong shape
+    with pytest.raises(BadRequest):
+        app_module.decode_cursor(cursor)
+
+
+@pytest.fixture
+def jobs(app_module):
+    """Five jobs, three sharing a created_at so only the id breaks the tie."""
+    tag = uuid.uuid4().hex
+    company = f"company-{tag}"
+    stamps = ["2020-01-01 00:00:00"] * 3 + ["2020-01-02 00:00:00", "2020-01-03 00:00:00"]
+    ids = [f"{tag}-{n}" for n in range(len(stamps))]
+    with app_module.app.app_context():
+        db = app_module.get_db()
+        db.execute("INSERT INTO companies (id, name) VALUES (?,?)", (company, company))
+        db.executemany(
+            "INSERT INTO jobs (id, title, description, company_id, created_at) VALUES (?,?,?,?,?)",
+            [(job_id, f"Engineer {job_id}", "Builds things", company, stamp) for job_id, stamp in zip(ids, stamps)],
+        )
+        db.commit()
+    app_module.invalidate_catalog()
+    yield set(ids)
+    with app_module.app.app_context():
+        db = app_module.get_db()
+        db.execute("DELETE FROM jobs WHERE company_id=?", (company,))
+        db.execute("DELETE FROM companies WHERE id=?", (company,))
+        db.commit()
+    app_module.invalidate_catalog()
+
+
+def test_pages_cover_every_row_once(client, jobs):
+    seen = []
+    cursor = None
+    while True:
+        url = "/api/jobs?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        body = client.get(url).get_json()
+        assert len(body["jobs"]) <= 2
+        seen.extend(job["id"] for job in body["jobs"] if job["id"] in jobs)
+        cursor = body["next"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen))
+    assert set(seen) == jobs
+
+
+def test_limit_is_validated(client):
+    assert client.get("/api/jobs?limit=0").status_code == 400
+    assert client.get("/api/jobs?limit=abc").status_code == 400
+    assert client.get("/api/jobs?cursor=abc").status_code == 400
+
+
+def test_without_limit_there_is_no_next(client, jobs):
+    body = client.get("/api/jobs").get_json()
+    assert "next" not in body
+    assert jobs <= {job["id"] for job in body["jobs"]}
@@ -0,0 +1,74 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+import migrations
+
+BASELINE_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "aegis.db")
+
+
+def schema_objects(conn):
+    return set(conn.execute("SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'").fetchall())
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """A copy of the checked-in database, which predates the migration runner."""
+    path = tmp_path / "legacy.db"
+    shutil.copy(BASELINE_DB, path)
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+def test_fresh_database_is_not_current(tmp_path):
+    conn = sqlite3.connect(tmp_path / "empty.db")
+    assert not migrations.schema_is_current(conn)
+    conn.close()
+
+
+def test_bootstrapped_database_is_current(app_module):
+    conn = sqlite3.connect(app_module.DATABASE)
+    assert migrations.schema_is_current(conn)
+    assert migrations.current_version(conn) == migrations.LATEST_VERSION
+    conn.close()
+    # A second boot finds the schema current and skips init_db
+    assert app_module.bootstrap_schema() is False
+
+
+def test_versions_are_unique_and_increasing():
+    versions = [version for version, _, _ in migrations.MIGRATIONS]
+    assert versions == sorted(set(versions))
+    assert versions[0] == 1
+
+
+def test_legacy_database_upgrades_to_fresh_schema(app_module, legacy_db):
+    assert not migrations.schema_is_current(legacy_db)
+    assert migrations.run_migrations(legacy_db) == migrations.LATEST_VERSION
+
+    fresh = sqlite3.connect(app_module.DATABASE)
+    assert schema_objects(legacy_db) == schema_objects(fresh)
+    fresh.close()
+
+
+def test_rerun_applies_nothing(legacy_db):
+    migrations.run_migrations(legacy_db)
+    applied = legacy_db.execute("SELECT version, applied_at FROM schema_version").fetchall()
+    assert migrations.run_migrations(legacy_db) == migrations.LATEST_VERSION
+    assert legacy_db.execute("SELECT version, applied_at FROM schema_version").fetchall() == applied
+
+
+def test_failed_step_is_rolled_back(legacy_db, monkeypatch):
+    migrations.run_migrations(legacy_db)
+
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER)")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [(migrations.LATEST_VERSION + 1, "broken", broken)])
+    with pytest.raises(RuntimeError):
+        migrations.run_migrations(legacy_db)
+    assert migrations.current_version(legacy_db) == migrations.LATEST_VERSION
+    assert not legacy_db.execute("SELECT 1 FROM sqlite_master WHERE name='half_done'").fetchone()
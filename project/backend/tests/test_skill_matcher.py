@@ -0,0 +1,56 @@
+import pytest
+
+from skill_matcher import DEFAULT_SKILLS, SkillMatcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    aliases = {}
+    for skill, names in DEFAULT_SKILLS.items():
+        aliases[skill] = skill
+        aliases.update((alias, skill) for alias in names)
+    return SkillMatcher(aliases)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Not inside longer words
+    ("HTML and CSS", ["HTML", "CSS"]),
+    ("JavaScript developer", ["JavaScript"]),
+    ("Javanese", []),
+    ("MLOps", []),
+    # Punctuation around a name is a boundary; punctuation inside one is part of it
+    ("(ML), Python.", ["ML", "Python"]),
+    ("C++ and C#", ["C++", "C#"]),
+    ("Node.js, Next.js", ["Node.js", "Next.js"]),
+    ("CI/CD pipelines", ["CI/CD"]),
+    # Shared trie prefixes resolve to the longest match
+    ("Ruby on Rails", ["Ruby on Rails"]),
+    ("React Native", ["React Native"]),
+    ("Spring Boot", ["Spring"]),
+])
+def test_boundaries(matcher, text, expected):
+    assert matcher.extract(text) == expected
+
+
+def test_aliases_map_to_canonical_names(matcher):
+    assert matcher.extract("JS, TS and K8s") == ["JavaScript", "TypeScript", "Kubernetes"]
+
+
+def test_case_insensitive_names(matcher):
+    assert matcher.extract("python, DOCKER and postgres") == ["Python", "Docker", "PostgreSQL"]
+
+
+def test_case_sensitive_names(matcher):
+    assert matcher.extract("Built a REST API") == ["REST"]
+    assert matcher.extract("the rest of the team") == []
+    assert matcher.extract("a swift agile rust fix") == []
+    assert matcher.extract("Swift and Rust") == ["Swift", "Rust"]
+
+
+def test_distinct_in_order_of_appearance(matcher):
+    assert matcher.extract("Docker, Python, docker, JS, JavaScript") == ["Docker", "Python", "JavaScript"]
+
+
+def test_empty_taxonomy_matches_nothing():
+    assert SkillMatcher({}).extract("Python") == []
+    assert SkillMatcher({"Python": "Python"}).extract(None) == []
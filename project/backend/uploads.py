@@ -0,0 +1,76 @@
+import tempfile
+from functools import cached_property
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+
+class CappedSpool(tempfile.SpooledTemporaryFile):
+    """
+    In-memory buffer that only spills to a temp file above `max_size` bytes
+    and refuses to grow past `max_bytes`.
+    """
+
+    def __init__(self, max_size, max_bytes, filename=None):
+        super().__init__(max_size=max_size, mode="rb+")
+        self.max_bytes = max_bytes
+        self.filename = filename
+        self.written = 0
+
+    def write(self, s):
+        self.written += len(s)
+        if self.max_bytes and self.written > self.max_bytes:
+            raise RequestEntityTooLarge(
+                f"{self.filename or 'Uploaded file'} exceeds the {self.max_bytes} byte upload limit"
+            )
+        return super().write(s)
+
+
+class UploadRequest(Request):
+    """
+    Request class that keeps uploaded files in memory (spilling above
+    UPLOAD_SPOOL_BYTES) and enforces MAX_FILE_BYTES per file while the
+    body is being read, so resumes never have to be saved to disk.
+    """
+
+    @property
+    def max_content_length(self):
+        # Flask's version always reads MAX_CONTENT_LENGTH; honour a per-route body_limit
+        if self.url_rule is None:
+            return super().max_content_length
+        return view_body_limit(current_app, self.url_rule.endpoint)
+
+    @cached_property
+    def upload_spools(self):
+        """Spools created for this request's files, in upload order."""
+        return []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        config = current_app.config
+        spool = CappedSpool(config["UPLOAD_SPOOL_BYTES"], config["MAX_FILE_BYTES"], filename)
+        self.upload_spools.append(spool)
+        return spool
+
+
+def body_limit(config_key):
+    """Give a view its own request body limit, read from `config_key` (0 = unlimited)."""
+    def decorate(view):
+        view.body_limit_key = config_key
+        return view
+    return decorate
+
+
+def view_body_limit(app, endpoint):
+    """The body limit for `endpoint`: its body_limit config if it has one, else MAX_CONTENT_LENGTH."""
+    key = getattr(app.view_functions.get(endpoint), "body_limit_key", "MAX_CONTENT_LENGTH")
+    return app.config[key] or None
+
+
+def upload_ext(filename):
+    return filename.rsplit(".", 1)[1].lower()
+
+
+def read_upload(file_storage):
+    """Return the full contents of an uploaded file, rewinding it first."""
+    file_storage.stream.seek(0)
+    return file_storage.stream.read()